@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of UserRepository reads: ORM entities mapped with `map_model_to_dto()` (the default)
+against Core rows mapped with `map_row_to_dto()` (`bypass_orm=True`).
+
+Runs the statements the repository issues against an in-memory SQLite database through the sync API,
+so it measures the client-side cost per row (ORM loading, identity map, DTO mapping), not the database.
+
+Usage:
+    python -m benchmarks.core_reads [rows]
+"""
+
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.infra.user.models import UserModel
+from src.infra.user.repos import UserRepository
+
+
+def _orm_read(session: Session, repo: UserRepository) -> list[Any]:
+    # Each request gets a fresh session, so the identity map is always cold
+    session.expunge_all()
+    return [repo.map_model_to_dto(entity) for entity in session.scalars(select(UserModel)).all()]
+
+
+def _core_read(session: Session, repo: UserRepository) -> list[Any]:
+    return [repo.map_row_to_dto(row) for row in session.execute(select(*UserModel.__table__.columns)).all()]
+
+
+def _rows_per_second(func: Callable[[], Any], rows: int) -> float:
+    # Best of 5 runs to reduce the noise
+    best = min(timeit.repeat(func, number=1, repeat=5))
+    return rows / best
+
+
+def _peak_bytes(func: Callable[[], Any]) -> int:
+    func()  # warm up the statement cache
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    engine = create_engine("sqlite://")
+    UserModel.metadata.create_all(engine, tables=[UserModel.__table__])  # type: ignore[list-item]
+    repo = UserRepository(AsyncSession())  # only its mapping methods are used
+    with Session(engine) as session:
+        session.execute(
+            insert(UserModel),
+            [{"username": f"user_{i}", "password_hash": f"scrypt$n=16384,r=8,p=1$salt$hash_{i}"} for i in range(rows)],
+        )
+        session.commit()
+
+        reads = {
+            "ORM entities": lambda: _orm_read(session, repo),
+            "Core rows": lambda: _core_read(session, repo),
+        }
+        print(f"rows={rows}")  # noqa: T201
+        for name, read in reads.items():
+            per_second = _rows_per_second(read, rows)
+            peak = _peak_bytes(read)
+            print(f"{name:<14} {per_second:>12,.0f} rows/s {peak / rows:>8.0f} B peak/row")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
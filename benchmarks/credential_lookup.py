@@ -0,0 +1,81 @@
+"""
+Micro-benchmark of the login credential lookup: the full ORM load of a user turned into a validated UserDTO
+(the way User looked up credentials before) against the column-projected `get_password_hash` statement.
+
+Runs against an in-memory SQLite database through the sync ORM, so it measures the client-side CPU
+and memory cost per lookup (statement compilation, ORM loading, identity map, DTO validation),
+not the database round trip, which is the same for both.
+
+Usage:
+    python -m benchmarks.credential_lookup [iterations]
+"""
+
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.domain.user import UserDTO
+from src.infra.user.models import UserModel
+from src.infra.user.repos import _PASSWORD_HASH_BY_USERNAME
+
+
+USERNAME = "benchmark_user"
+
+
+def _orm_lookup(session: Session) -> Any:
+    # Each request gets a fresh session, so the identity map is always cold
+    session.expunge_all()
+    user = session.get_one(UserModel, USERNAME)
+    return UserDTO(username=user.username, password_hash=user.password_hash)
+
+
+def _projected_lookup(session: Session) -> Any:
+    return session.execute(_PASSWORD_HASH_BY_USERNAME, {"username": USERNAME}).scalar_one_or_none()
+
+
+def _us_per_call(func: Callable[[], Any], iterations: int) -> float:
+    # Best of 5 runs to reduce the noise
+    best = min(timeit.repeat(func, number=iterations, repeat=5))
+    return best / iterations * 1_000_000
+
+
+def _peak_bytes_per_call(func: Callable[[], Any], iterations: int) -> float:
+    func()  # warm up the statement cache
+    total = 0
+    tracemalloc.start()
+    for _ in range(iterations):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - baseline
+    tracemalloc.stop()
+    return total / iterations
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    engine = create_engine("sqlite://")
+    UserModel.metadata.create_all(engine, tables=[UserModel.__table__])  # type: ignore[list-item]
+    with Session(engine) as session:
+        session.add(UserModel(username=USERNAME, password_hash="scrypt$n=16384,r=8,p=1$salt$hash"))
+        session.commit()
+
+        lookups = {
+            "ORM load + UserDTO": lambda: _orm_lookup(session),
+            "get_password_hash": lambda: _projected_lookup(session),
+        }
+        print(f"iterations={iterations}")  # noqa: T201
+        for name, lookup in lookups.items():
+            us = _us_per_call(lookup, iterations)
+            peak = _peak_bytes_per_call(lookup, min(iterations, 1_000))
+            print(f"{name:<20} {us:>8.1f} us/lookup {peak / 1024:>8.1f} KiB peak/lookup")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
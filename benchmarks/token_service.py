@@ -0,0 +1,94 @@
+"""
+Micro-benchmark of access token encoding/decoding: TokenService against per-call `jwt.encode`/`jwt.decode`
+with the key passed as configured on every call (the way User did it before TokenService).
+
+For HS256 (the configured algorithm by default) both are on par, within the run-to-run noise:
+HMAC and JSON work dominate, and preparing an HMAC key is cheap. Preparing keys once pays off
+for asymmetric algorithms, where the per-call path parses the PEM private key on every encode,
+so an EdDSA run with a generated key is included too. Decoding is dominated by signature verification either way.
+
+Usage:
+    python -m benchmarks.token_service [iterations]
+"""
+
+import sys
+import timeit
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from src.domain.user.tokens import TokenService, build_token_service
+from src.settings import settings
+
+
+def _payload() -> dict[str, Any]:
+    return {
+        settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD: "benchmark_user",
+        "exp": datetime.now(UTC) + timedelta(minutes=settings.AUTH_ACCESS_TOKEN_EXPIRE_MINUTES),
+    }
+
+
+def _legacy_encode(payload: dict[str, Any]) -> str:
+    return jwt.encode(payload, settings.AUTH_SECRET_KEY.get_secret_value(), algorithm=settings.AUTH_HASH_ALGORITHM)
+
+
+def _legacy_decode(token: str) -> dict[str, Any]:
+    return jwt.decode(token, settings.AUTH_SECRET_KEY.get_secret_value(), algorithms=[settings.AUTH_HASH_ALGORITHM])
+
+
+def _ops_per_second(func: Any, iterations: int) -> float:
+    # Best of 5 runs to reduce the noise
+    best = min(timeit.repeat(func, number=iterations, repeat=5))
+    return iterations / best
+
+
+def _eddsa_keys() -> tuple[str, str]:
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_pem.decode(), public_pem.decode()
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    service = build_token_service()
+    payload = _payload()
+    token = service.encode(payload)
+
+    private_pem, public_pem = _eddsa_keys()
+    eddsa_service = TokenService("EdDSA", signing_keys={"benchmark": private_pem})
+    eddsa_token = eddsa_service.encode(payload)
+
+    results = {
+        f"{service.algorithm} encode legacy": _ops_per_second(lambda: _legacy_encode(payload), iterations),
+        f"{service.algorithm} encode TokenService": _ops_per_second(lambda: service.encode(payload), iterations),
+        f"{service.algorithm} decode legacy": _ops_per_second(lambda: _legacy_decode(token), iterations),
+        f"{service.algorithm} decode TokenService": _ops_per_second(lambda: service.decode(token), iterations),
+        "EdDSA encode legacy": _ops_per_second(
+            lambda: jwt.encode(payload, private_pem, algorithm="EdDSA"),
+            iterations,
+        ),
+        "EdDSA encode TokenService": _ops_per_second(lambda: eddsa_service.encode(payload), iterations),
+        "EdDSA decode legacy": _ops_per_second(
+            lambda: jwt.decode(eddsa_token, public_pem, algorithms=["EdDSA"]),
+            iterations,
+        ),
+        "EdDSA decode TokenService": _ops_per_second(lambda: eddsa_service.decode(eddsa_token), iterations),
+    }
+    print(f"iterations={iterations}")  # noqa: T201
+    for name, ops in results.items():
+        print(f"{name:<28} {ops:>12,.0f} ops/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 from src.app.auth.handlers import router as auth_router
+from src.app.users.handlers import router as users_router
+from src.app.well_known.handlers import router as well_known_router
 
 
 __all__ = [
     "auth_router",
+    "users_router",
+    "well_known_router",
 ]
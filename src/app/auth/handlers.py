@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.app.auth import schemas
 from src.app.dependencies.aggregates import user_aggregate_di
-from src.app.dependencies.auth import current_user_di
-from src.domain.user import CreateUserDTO, InvalidPasswordError, LoginUserDTO, User, UserAlreadyExistsError, UserDTO
+from src.app.dependencies.auth import current_user_di, introspection_client_di, oauth2_scheme
+from src.domain.user import (
+    CreateUserDTO,
+    InvalidPasswordError,
+    InvalidRefreshTokenError,
+    LoginUserDTO,
+    PasswordHashingOverloadedError,
+    User,
+    UserAlreadyExistsError,
+    UserDoesNotExistError,
+    UserIdentityDTO,
+)
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -22,6 +33,8 @@ async def register_user(
         )
     except UserAlreadyExistsError:
         raise HTTPException(status_code=400, detail="User with this username already exists.")
+    except PasswordHashingOverloadedError:
+        raise HTTPException(status_code=503, detail="Server is busy, try again later.", headers={"Retry-After": "1"})
 
 
 @router.post("/login")
@@ -32,9 +45,14 @@ async def oauth2_login(
     """Neededd for OAUTH2 login."""
 
     try:
-        token = await user_aggregate.login(LoginUserDTO(username=form_data.username, password=form_data.password))
-        return schemas.LoginResponse(access_token=token, token_type="bearer")
-    except UserAlreadyExistsError:
+        login_dto = LoginUserDTO(username=form_data.username, password=form_data.password)
+        tokens = await user_aggregate.login_with_refresh_token(login_dto)
+        return schemas.LoginResponse(
+            access_token=tokens.access_token,
+            token_type="bearer",
+            refresh_token=tokens.refresh_token,
+        )
+    except UserDoesNotExistError:
         raise HTTPException(status_code=400, detail="User with this username does not exist.")
     except InvalidPasswordError:
         raise HTTPException(
@@ -42,6 +60,8 @@ async def oauth2_login(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    except PasswordHashingOverloadedError:
+        raise HTTPException(status_code=503, detail="Server is busy, try again later.", headers={"Retry-After": "1"})
 
 
 @router.post("/login-json")
@@ -52,9 +72,14 @@ async def json_login(
     """Needed for registration by credentials in JSON format."""
 
     try:
-        token = await user_aggregate.login(LoginUserDTO(username=login_data.username, password=login_data.password))
-        return schemas.LoginResponse(access_token=token, token_type="bearer")
-    except UserAlreadyExistsError:
+        login_dto = LoginUserDTO(username=login_data.username, password=login_data.password)
+        tokens = await user_aggregate.login_with_refresh_token(login_dto)
+        return schemas.LoginResponse(
+            access_token=tokens.access_token,
+            token_type="bearer",
+            refresh_token=tokens.refresh_token,
+        )
+    except UserDoesNotExistError:
         raise HTTPException(status_code=400, detail="User with this username does not exist.")
     except InvalidPasswordError:
         raise HTTPException(
@@ -62,12 +87,65 @@ async def json_login(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    except PasswordHashingOverloadedError:
+        raise HTTPException(status_code=503, detail="Server is busy, try again later.", headers={"Retry-After": "1"})
+
+
+@router.post("/refresh", response_model=schemas.LoginResponse)
+async def refresh(
+    refresh_data: schemas.RefreshRequest,
+    user_aggregate: User = Depends(user_aggregate_di),
+) -> schemas.LoginResponse | JSONResponse:
+    """Exchange a refresh token for a new access and refresh token pair."""
+    try:
+        tokens = await user_aggregate.refresh(refresh_data.refresh_token)
+    except InvalidRefreshTokenError:
+        # Returned rather than raised: raising rolls the request transaction back,
+        # and with it the revocation of the token family on a reuse
+        return JSONResponse(status_code=401, content={"detail": "Refresh token is invalid or expired."})
+    return schemas.LoginResponse(
+        access_token=tokens.access_token,
+        token_type="bearer",
+        refresh_token=tokens.refresh_token,
+    )
+
+
+@router.post("/introspect")
+async def introspect(
+    introspect_data: schemas.IntrospectRequest,
+    _: str = Depends(introspection_client_di),
+    user_aggregate: User = Depends(user_aggregate_di),
+) -> schemas.IntrospectResponse:
+    """
+    Validate a batch of access tokens. Results are in the order of the request tokens.
+    Only for the clients in AUTH_INTROSPECTION_CLIENTS, authenticated with HTTP Basic.
+    """
+    results = await user_aggregate.introspect(introspect_data.tokens)
+    return schemas.IntrospectResponse(
+        results=[
+            schemas.TokenIntrospection(active=result.active, username=result.username, exp=result.expires_at)
+            for result in results
+        ],
+    )
 
 
 @router.get("/me")
 async def get_current_user(
-    current_user: UserDTO = Depends(current_user_di),
+    current_user: UserIdentityDTO = Depends(current_user_di),
 ) -> schemas.CurrentUserResponse:
     return schemas.CurrentUserResponse(
         username=current_user.username,
     )
+
+
+@router.post("/logout", status_code=204)
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    user_aggregate: User = Depends(user_aggregate_di),
+) -> Response:
+    """Revoke the access token."""
+    try:
+        await user_aggregate.logout(token)
+    except UserDoesNotExistError:
+        raise HTTPException(status_code=401, detail="User is not authenticated.")
+    return Response(status_code=204)
@@ -1,4 +1,8 @@
-from pydantic import BaseModel, SecretStr
+from datetime import datetime
+
+from pydantic import BaseModel, Field, SecretStr
+
+from src.settings import settings
 
 
 class RegistrationRequest(BaseModel):
@@ -18,7 +22,26 @@ class LoginRequest(BaseModel):
 class LoginResponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class CurrentUserResponse(BaseModel):
     username: str
+
+
+class IntrospectRequest(BaseModel):
+    tokens: list[str] = Field(max_length=settings.AUTH_INTROSPECT_MAX_TOKENS)
+
+
+class TokenIntrospection(BaseModel):
+    active: bool
+    username: str | None = None
+    exp: datetime | None = None
+
+
+class IntrospectResponse(BaseModel):
+    results: list[TokenIntrospection]
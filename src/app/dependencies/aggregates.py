@@ -1,9 +1,13 @@
 from fastapi import Depends
 
-from src.app.dependencies.repos import user_repo_di
-from src.domain.user import IUserRepo, User
+from src.app.dependencies.repos import refresh_token_repo_di, revoked_token_repo_di, user_repo_di
+from src.domain.user import IRefreshTokenRepo, IRevokedTokenRepo, IUserRepo, User
 
 
-async def user_aggregate_di(repo: IUserRepo = Depends(user_repo_di)) -> User:
+async def user_aggregate_di(
+    repo: IUserRepo = Depends(user_repo_di),
+    revoked_tokens_repo: IRevokedTokenRepo = Depends(revoked_token_repo_di),
+    refresh_tokens_repo: IRefreshTokenRepo = Depends(refresh_token_repo_di),
+) -> User:
     """Get the User aggregate as a dependency."""
-    return User(repo=repo)
+    return User(repo=repo, revoked_tokens_repo=revoked_tokens_repo, refresh_tokens_repo=refresh_tokens_repo)
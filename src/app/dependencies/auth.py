@@ -1,20 +1,67 @@
+import hmac
+
 from fastapi import Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.security import HTTPBasic, HTTPBasicCredentials, OAuth2PasswordBearer
 
 from src.app.dependencies.aggregates import user_aggregate_di
-from src.domain.user import User, UserDoesNotExistError, UserDTO
+from src.domain.user import TokenService, User, UserDoesNotExistError, UserDTO, UserIdentityDTO, token_service
+from src.settings import settings
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+client_basic_scheme = HTTPBasic(auto_error=False)
 
 
 async def current_user_di(
     token: str = Depends(oauth2_scheme),
     user_aggregate: User = Depends(user_aggregate_di),
+) -> UserIdentityDTO:
+    """
+    Get the current user identity as a dependency.
+    With AUTH_STATELESS_TOKENS enabled it is resolved from the token alone, without a DB round trip.
+    """
+    try:
+        return await user_aggregate.get_current_identity(token)
+    except UserDoesNotExistError:
+        raise HTTPException(status_code=401, detail="User is not authenticated.")
+
+
+async def fresh_current_user_di(
+    token: str = Depends(oauth2_scheme),
+    user_aggregate: User = Depends(user_aggregate_di),
 ) -> UserDTO:
-    """Get the current user as a dependency."""
+    """Get the current user loaded from the DB as a dependency, for routes that need the up-to-date user."""
     try:
-        print("token:", token)
         return await user_aggregate.get_current(token)
     except UserDoesNotExistError:
         raise HTTPException(status_code=401, detail="User is not authenticated.")
+
+
+async def admin_user_di(current_user: UserIdentityDTO = Depends(current_user_di)) -> UserIdentityDTO:
+    """Get the current user identity as a dependency, if the user is an admin (AUTH_ADMIN_USERNAMES)."""
+    if current_user.username not in settings.AUTH_ADMIN_USERNAMES:
+        raise HTTPException(status_code=403, detail="Not enough permissions.")
+    return current_user
+
+
+async def introspection_client_di(
+    credentials: HTTPBasicCredentials | None = Depends(client_basic_scheme),
+) -> str:
+    """Authenticate a client allowed to introspect tokens (AUTH_INTROSPECTION_CLIENTS), get its ID."""
+    secret = settings.AUTH_INTROSPECTION_CLIENTS.get(credentials.username) if credentials is not None else None
+    if (
+        credentials is None
+        or secret is None
+        or not hmac.compare_digest(credentials.password.encode(), secret.get_secret_value().encode())
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Client is not authenticated.",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+    return credentials.username
+
+
+async def token_service_di() -> TokenService:
+    """Get the access token service as a dependency."""
+    return token_service
@@ -2,9 +2,19 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.infra.db import get_async_session
-from src.infra.user.repos import UserRepository
+from src.infra.user.repos import RefreshTokenRepository, RevokedTokenRepository, UserRepository
 
 
 async def user_repo_di(session: AsyncSession = Depends(get_async_session)) -> UserRepository:
     """Get the User repository as a dependency."""
     return UserRepository(session=session)
+
+
+async def revoked_token_repo_di(session: AsyncSession = Depends(get_async_session)) -> RevokedTokenRepository:
+    """Get the RevokedToken repository as a dependency."""
+    return RevokedTokenRepository(session=session)
+
+
+async def refresh_token_repo_di(session: AsyncSession = Depends(get_async_session)) -> RefreshTokenRepository:
+    """Get the RefreshToken repository as a dependency."""
+    return RefreshTokenRepository(session=session)
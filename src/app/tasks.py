@@ -0,0 +1,34 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from src.domain.user import revocation_list
+from src.infra.db import AsyncSessionLocal
+from src.infra.user.repos import RevokedTokenRepository, UserRepository
+from src.infra.user.username_filter import known_usernames_filter
+
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(func: Callable[[], Awaitable[None]], interval_seconds: float) -> None:
+    """Run the function every `interval_seconds` until cancelled, logging its failures."""
+    while True:
+        try:
+            await func()
+        except Exception:
+            logger.exception("Periodic task %s failed", func.__name__)
+        await asyncio.sleep(interval_seconds)
+
+
+async def sync_revocation_list() -> None:
+    """Catch the in-process revocation list up with the revoked tokens table."""
+    async with AsyncSessionLocal() as session:
+        await revocation_list.sync(RevokedTokenRepository(session))
+        await session.commit()
+
+
+async def reload_known_usernames() -> None:
+    """Rebuild the filter of existing usernames from the users table."""
+    async with AsyncSessionLocal() as session:
+        await known_usernames_filter.reload(UserRepository(session).iter_usernames())
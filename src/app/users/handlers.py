@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from src.app.dependencies.aggregates import user_aggregate_di
+from src.app.dependencies.auth import admin_user_di
+from src.app.users import schemas
+from src.domain.user import InvalidPageCursorError, User, UserIdentityDTO
+from src.settings import settings
+
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+@router.get("")
+async def list_users(
+    after: str | None = None,
+    limit: int = Query(default=settings.USERS_PAGE_DEFAULT_LIMIT, ge=1, le=settings.USERS_PAGE_MAX_LIMIT),
+    _: UserIdentityDTO = Depends(admin_user_di),
+    user_aggregate: User = Depends(user_aggregate_di),
+) -> schemas.UsersPageResponse:
+    """
+    Users ordered by username, page by page: pass `next_cursor` of a page as `after` to get the next one.
+    Only for admins.
+    """
+    try:
+        page = await user_aggregate.list_users(after=after, limit=limit)
+    except InvalidPageCursorError:
+        raise HTTPException(status_code=400, detail="Invalid page cursor.")
+    return schemas.UsersPageResponse(
+        users=[schemas.UserResponse(username=user.username) for user in page.users],
+        next_cursor=page.next_cursor,
+    )
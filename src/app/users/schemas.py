@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class UserResponse(BaseModel):
+    username: str
+
+
+class UsersPageResponse(BaseModel):
+    users: list[UserResponse]
+    next_cursor: str | None = None
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from src.app.dependencies.auth import token_service_di
+from src.domain.user import TokenService
+from src.settings import settings
+
+
+router = APIRouter(prefix="/.well-known", tags=["well-known"])
+
+
+@router.get("/jwks.json")
+async def jwks(tokens: TokenService = Depends(token_service_di)) -> JSONResponse:
+    """Public keys for verifying access tokens, so other services don't need to call /auth/me."""
+    return JSONResponse(
+        content=tokens.jwks,
+        headers={"Cache-Control": f"public, max-age={settings.AUTH_JWKS_MAX_AGE_SECONDS}"},
+    )
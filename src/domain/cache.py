@@ -0,0 +1,149 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class _CacheEntry(Generic[V]):
+    value: V
+    expires_at: float
+    size: int
+
+
+class LRUCache(Generic[K, V]):
+    """
+    In-process LRU cache with a TTL, bounded by the number of entries and optionally by their size in bytes.
+
+    Subclasses may derive the stored key, the expiry and the size of an entry from the key and the value
+    by overriding `_make_key()`, `_get_expires_at()` and `_estimate_size()`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param max_entries: Maximum number of cached entries
+        :param ttl_seconds: Upper bound for an entry lifetime
+        :param max_bytes: Maximum approximate memory used by the entries, unbounded by default
+        :param clock: Returns the current time in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _CacheEntry[V]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: K) -> V | None:
+        """Get the cached value, or None if it is not cached or already expired."""
+        entry_key = self._make_key(key)
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if entry.expires_at <= self._clock():
+            self._remove(entry_key)
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(entry_key)
+        self._hits += 1
+        return entry.value
+
+    def set(self, key: K, value: V) -> None:
+        """Store the value, unless it is already expired or doesn't fit in the cache at all."""
+        now = self._clock()
+        expires_at = self._get_expires_at(value, now)
+        if expires_at <= now:
+            return
+
+        entry_key = self._make_key(key)
+        size = self._estimate_size(entry_key, value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        if entry_key in self._entries:
+            self._remove(entry_key)
+        self._entries[entry_key] = _CacheEntry(value=value, expires_at=expires_at, size=size)
+        self._size_bytes += size
+        self._evict()
+
+    def delete(self, key: K) -> None:
+        """Drop the key from the cache if it is there."""
+        entry_key = self._make_key(key)
+        if entry_key in self._entries:
+            self._remove(entry_key)
+
+    def delete_many(self, keys: Iterable[K]) -> None:
+        for key in keys:
+            self.delete(key)
+
+    def clear(self) -> None:
+        """Drop all the entries. Counters are kept."""
+        self._entries.clear()
+        self._size_bytes = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            entries=len(self._entries),
+            size_bytes=self._size_bytes,
+        )
+
+    def _make_key(self, key: K) -> Hashable:
+        """Key the entry is stored under."""
+        return key
+
+    def _get_expires_at(self, value: V, now: float) -> float:
+        return now + self.ttl_seconds
+
+    def _estimate_size(self, entry_key: Hashable, value: V) -> int:
+        """Approximate memory used by an entry, only counted against `max_bytes`."""
+        return 0
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits its bounds."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or (self.max_bytes is not None and self._size_bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _remove(self, entry_key: Hashable) -> None:
+        entry = self._entries.pop(entry_key)
+        self._size_bytes -= entry.size
@@ -0,0 +1,75 @@
+from collections.abc import Collection
+from dataclasses import dataclass
+from typing import Any
+
+
+class Specification:
+    """
+    Criteria entities are selected by, referring to DTO fields by name.
+    Specifications are plain data, repositories translate them into queries.
+    Combine them with `&`, `|` and `~`.
+    """
+
+    __slots__ = ()
+
+    def __and__(self, other: "Specification") -> "And":
+        return And((self, other))
+
+    def __or__(self, other: "Specification") -> "Or":
+        return Or((self, other))
+
+    def __invert__(self) -> "Not":
+        return Not(self)
+
+
+@dataclass(frozen=True, slots=True)
+class Eq(Specification):
+    """Field is equal to the value, or is null if the value is None."""
+
+    field: str
+    value: Any
+
+
+@dataclass(frozen=True, slots=True)
+class In(Specification):
+    field: str
+    values: Collection[Any]
+
+
+@dataclass(frozen=True, slots=True)
+class Lt(Specification):
+    field: str
+    value: Any
+
+
+@dataclass(frozen=True, slots=True)
+class Le(Specification):
+    field: str
+    value: Any
+
+
+@dataclass(frozen=True, slots=True)
+class Gt(Specification):
+    field: str
+    value: Any
+
+
+@dataclass(frozen=True, slots=True)
+class Ge(Specification):
+    field: str
+    value: Any
+
+
+@dataclass(frozen=True, slots=True)
+class And(Specification):
+    specs: tuple[Specification, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Or(Specification):
+    specs: tuple[Specification, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Not(Specification):
+    spec: Specification
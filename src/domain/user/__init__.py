@@ -1,11 +1,28 @@
-from src.domain.user.dtos import CreateUserDTO, LoginUserDTO, UserDTO
+from src.domain.user.dtos import (
+    CreateUserDTO,
+    LoginUserDTO,
+    RefreshTokenDTO,
+    RevokedTokenDTO,
+    TokenIntrospectionDTO,
+    TokenPairDTO,
+    UserDTO,
+    UserIdentityDTO,
+    UsersPageDTO,
+)
 from src.domain.user.errors import (
+    InvalidPageCursorError,
     InvalidPasswordError,
+    InvalidRefreshTokenError,
+    PasswordHashingOverloadedError,
+    RefreshTokenReuseError,
     UnAuthorizedUserError,
     UserAlreadyExistsError,
     UserDoesNotExistError,
+    UserUpdateConflictError,
 )
-from src.domain.user.repos import IUserRepo
+from src.domain.user.repos import IRefreshTokenRepo, IRevokedTokenRepo, IUserRepo
+from src.domain.user.revocation import RevocationList, revocation_list
+from src.domain.user.tokens import TokenService, token_service
 from src.domain.user.user import User
 
 
@@ -15,8 +32,25 @@ __all__ = [
     "UserAlreadyExistsError",
     "UnAuthorizedUserError",
     "InvalidPasswordError",
+    "PasswordHashingOverloadedError",
+    "InvalidRefreshTokenError",
+    "RefreshTokenReuseError",
+    "InvalidPageCursorError",
+    "UserUpdateConflictError",
     "UserDTO",
+    "UserIdentityDTO",
     "LoginUserDTO",
     "CreateUserDTO",
     "IUserRepo",
+    "IRevokedTokenRepo",
+    "IRefreshTokenRepo",
+    "RevokedTokenDTO",
+    "RefreshTokenDTO",
+    "TokenPairDTO",
+    "TokenIntrospectionDTO",
+    "UsersPageDTO",
+    "RevocationList",
+    "revocation_list",
+    "TokenService",
+    "token_service",
 ]
@@ -0,0 +1,47 @@
+import math
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """
+    Bloom filter of strings.
+
+    `item in bloom` is False only if the item was never added, and may be a false positive
+    with probability around `error_rate` while the filter holds at most `capacity` items.
+    Items can't be removed, rebuild the filter to drop them.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, items: Iterable[str] = ()):
+        """
+        :param capacity: Expected number of items
+        :param error_rate: Acceptable false positive probability at full capacity
+        :param items: Initial items
+        """
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        for item in items:
+            self.add(item)
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: k positions out of two independent 64-bit halves of one digest
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
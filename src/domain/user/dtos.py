@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, SecretStr
 
 
@@ -11,6 +13,45 @@ class LoginUserDTO(BaseModel):
     password: SecretStr
 
 
-class UserDTO(BaseModel):
+class UserIdentityDTO(BaseModel):
+    """User fields that are safe to sign into an access token."""
+
     username: str
+
+
+class UserDTO(UserIdentityDTO):
     password_hash: SecretStr
+    # Version of the stored user this DTO was read from, None for a new user or a blind write
+    version: int | None = None
+
+
+class RevokedTokenDTO(BaseModel):
+    jti: str
+    expires_at: datetime
+    revoked_at: datetime
+
+
+class RefreshTokenDTO(BaseModel):
+    token_hash: str
+    family_id: str
+    username: str
+    expires_at: datetime
+    used_at: datetime | None = None
+    revoked_at: datetime | None = None
+
+
+class TokenPairDTO(BaseModel):
+    access_token: str
+    refresh_token: str
+
+
+class UsersPageDTO(BaseModel):
+    users: list[UserIdentityDTO]
+    # Opaque cursor of the next page, None on the last page
+    next_cursor: str | None = None
+
+
+class TokenIntrospectionDTO(BaseModel):
+    active: bool
+    username: str | None = None
+    expires_at: datetime | None = None
@@ -12,3 +12,23 @@ class InvalidPasswordError(Exception):
 
 class UnAuthorizedUserError(Exception):
     pass
+
+
+class PasswordHashingOverloadedError(Exception):
+    pass
+
+
+class InvalidRefreshTokenError(Exception):
+    pass
+
+
+class RefreshTokenReuseError(InvalidRefreshTokenError):
+    pass
+
+
+class InvalidPageCursorError(Exception):
+    pass
+
+
+class UserUpdateConflictError(Exception):
+    """The user was changed by someone else since it was read."""
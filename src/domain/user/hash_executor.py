@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Literal, TypeVar
+
+from src.domain.user.errors import PasswordHashingOverloadedError
+from src.settings import settings
+
+
+R = TypeVar("R")
+
+
+@dataclass(frozen=True, slots=True)
+class PasswordHashExecutorStats:
+    running: int
+    queued: int
+    peak_queued: int
+    completed: int
+    rejected: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+
+class PasswordHashExecutor:
+    """
+    Runs CPU-bound password hashing outside the event loop.
+
+    Calls go to a thread or process pool, at most `max_concurrency` of them at once.
+    Calls waiting for a free slot are counted as queued; once `max_queue_size` calls are waiting
+    new ones fail fast with PasswordHashingOverloadedError instead of piling up behind the pool.
+    """
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"],
+        max_workers: int | None,
+        max_concurrency: int,
+        max_queue_size: int,
+    ):
+        """
+        :param kind: Pool type, "process" scales CPU-bound hashing across cores
+        :param max_workers: Pool size, None for the executor default
+        :param max_concurrency: Maximum number of hashing calls submitted to the pool at once
+        :param max_queue_size: Maximum number of calls waiting for a free slot
+        """
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self._executor: Executor | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._running = 0
+        self._queued = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    async def run(self, func: Callable[..., R], *args: Any) -> R:
+        """Run `func(*args)` in the pool. For a process pool both must be picklable."""
+        if self._queued >= self.max_queue_size:
+            self._rejected += 1
+            raise PasswordHashingOverloadedError("Too many password hashing requests in the queue.")
+
+        self._queued += 1
+        self._peak_queued = max(self._peak_queued, self._queued)
+        wait_started_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        waited = time.perf_counter() - wait_started_at
+        self._total_wait_seconds += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._running -= 1
+            self._completed += 1
+            self._semaphore.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut the pool down. It is recreated on the next call."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
+    @property
+    def stats(self) -> PasswordHashExecutorStats:
+        return PasswordHashExecutorStats(
+            running=self._running,
+            queued=self._queued,
+            peak_queued=self._peak_queued,
+            completed=self._completed,
+            rejected=self._rejected,
+            total_wait_seconds=self._total_wait_seconds,
+            max_wait_seconds=self._max_wait_seconds,
+        )
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hash",
+                )
+        return self._executor
+
+
+password_hash_executor = PasswordHashExecutor(
+    kind=settings.AUTH_PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.AUTH_PASSWORD_HASH_MAX_WORKERS,
+    max_concurrency=settings.AUTH_PASSWORD_HASH_MAX_CONCURRENCY,
+    max_queue_size=settings.AUTH_PASSWORD_HASH_MAX_QUEUE_SIZE,
+)
@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import hmac
+import secrets
+from typing import Protocol
+
+from src.settings import settings
+
+
+class IPasswordHasher(Protocol):
+    """
+    Password hasher producing self-describing hashes.
+
+    Hashes look like `<algorithm>$<cost parameters>$<salt>$<hash>`, so any hasher can tell
+    which algorithm and cost were used for a stored hash without extra columns.
+    Implementations must be picklable, as they are run in a process pool.
+    """
+
+    algorithm: str
+
+    def hash(self, password: str) -> str:
+        raise NotImplementedError
+
+    def verify(self, password: str, encoded: str) -> bool:
+        raise NotImplementedError
+
+    def needs_rehash(self, encoded: str) -> bool:
+        raise NotImplementedError
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.b64decode(value.encode("ascii"))
+
+
+class ScryptPasswordHasher:
+    """Memory-hard scrypt hasher: `scrypt$n=<n>,r=<r>,p=<p>$<salt>$<hash>`."""
+
+    algorithm = "scrypt"
+
+    def __init__(self, n: int, r: int, p: int, salt_size: int = 16, hash_size: int = 64):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.hash_size = hash_size
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(self.salt_size)
+        derived = self._derive(password, salt, self.n, self.r, self.p, self.hash_size)
+        params = self._format_params(self.n, self.r, self.p)
+        return f"{self.algorithm}${params}${_b64encode(salt)}${_b64encode(derived)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        algorithm, params, salt, expected = encoded.split("$")
+        if algorithm != self.algorithm:
+            return False
+        n, r, p = self._parse_params(params)
+        expected_bytes = _b64decode(expected)
+        derived = self._derive(password, _b64decode(salt), n, r, p, len(expected_bytes))
+        return hmac.compare_digest(derived, expected_bytes)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        algorithm, params, *_ = encoded.split("$")
+        return algorithm != self.algorithm or self._parse_params(params) != (self.n, self.r, self.p)
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n: int, r: int, p: int, hash_size: int) -> bytes:
+        # scrypt needs 128 * n * r * p bytes, OpenSSL rejects it with the default 32 MiB limit for higher costs
+        maxmem = 2 * 128 * n * r * p
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=hash_size)
+
+    @staticmethod
+    def _format_params(n: int, r: int, p: int) -> str:
+        return f"n={n},r={r},p={p}"
+
+    @staticmethod
+    def _parse_params(params: str) -> tuple[int, int, int]:
+        values = dict(param.split("=") for param in params.split(","))
+        return int(values["n"]), int(values["r"]), int(values["p"])
+
+
+class PBKDF2PasswordHasher:
+    """PBKDF2-HMAC-SHA256 hasher: `pbkdf2_sha256$<iterations>$<salt>$<hash>`."""
+
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, iterations: int, salt_size: int = 16):
+        self.iterations = iterations
+        self.salt_size = salt_size
+
+    def hash(self, password: str) -> str:
+        salt = secrets.token_bytes(self.salt_size)
+        derived = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${_b64encode(salt)}${_b64encode(derived)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        algorithm, iterations, salt, expected = encoded.split("$")
+        if algorithm != self.algorithm:
+            return False
+        derived = hashlib.pbkdf2_hmac("sha256", password.encode(), _b64decode(salt), int(iterations))
+        return hmac.compare_digest(derived, _b64decode(expected))
+
+    def needs_rehash(self, encoded: str) -> bool:
+        algorithm, iterations, *_ = encoded.split("$")
+        return algorithm != self.algorithm or int(iterations) != self.iterations
+
+
+class LegacySHA256PasswordHasher:
+    """
+    Hasher for hashes created before hashes became self-describing:
+    a hex SHA-256 digest of the password followed by the global AUTH_PASSWORD_SALT.
+    Only used to verify such hashes until they are rehashed on login.
+    """
+
+    algorithm = "sha256"
+
+    def __init__(self, salt: str):
+        self.salt = salt
+
+    def hash(self, password: str) -> str:
+        return hashlib.sha256((password + self.salt).encode()).hexdigest()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return hmac.compare_digest(self.hash(password), encoded)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return True
+
+
+class PasswordHasher:
+    """
+    Hasher used by the User aggregate.
+
+    New hashes are always created by the configured `preferred` hasher. Stored hashes are verified by the hasher
+    of their own algorithm and need a rehash when either the algorithm or its cost differs from the preferred one.
+    It makes changing the algorithm or tuning its cost possible without a data migration.
+    """
+
+    def __init__(self, preferred: IPasswordHasher, *others: IPasswordHasher, legacy: IPasswordHasher | None = None):
+        """
+        :param preferred: Hasher for new hashes
+        :param others: Hashers still accepted for verification
+        :param legacy: Hasher for hashes without an algorithm prefix
+        """
+        self.preferred = preferred
+        self.legacy = legacy
+        self._hashers = {hasher.algorithm: hasher for hasher in (*others, preferred)}
+
+    def hash(self, password: str) -> str:
+        return self.preferred.hash(password)
+
+    def verify(self, password: str, encoded: str) -> bool:
+        hasher = self._get_hasher(encoded)
+        if hasher is None:
+            return False
+        try:
+            return hasher.verify(password, encoded)
+        except (ValueError, KeyError):
+            # Malformed hash
+            return False
+
+    def needs_rehash(self, encoded: str) -> bool:
+        if self._get_hasher(encoded) is not self.preferred:
+            return True
+        return self.preferred.needs_rehash(encoded)
+
+    def _get_hasher(self, encoded: str) -> IPasswordHasher | None:
+        if "$" not in encoded:
+            return self.legacy
+        algorithm = encoded.split("$", 1)[0]
+        return self._hashers.get(algorithm)
+
+
+def build_password_hasher() -> PasswordHasher:
+    """Build the password hasher from the settings."""
+    scrypt = ScryptPasswordHasher(n=settings.AUTH_SCRYPT_N, r=settings.AUTH_SCRYPT_R, p=settings.AUTH_SCRYPT_P)
+    pbkdf2 = PBKDF2PasswordHasher(iterations=settings.AUTH_PBKDF2_ITERATIONS)
+    legacy = LegacySHA256PasswordHasher(salt=settings.AUTH_PASSWORD_SALT.get_secret_value())
+    if settings.AUTH_PASSWORD_HASHER == "pbkdf2_sha256":
+        return PasswordHasher(pbkdf2, scrypt, legacy=legacy)
+    return PasswordHasher(scrypt, pbkdf2, legacy=legacy)
+
+
+password_hasher = build_password_hasher()
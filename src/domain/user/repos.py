@@ -1,11 +1,93 @@
-from typing import Protocol
+from collections.abc import Collection
+from datetime import datetime
+from typing import Any, Protocol
 
-from src.domain.user.dtos import UserDTO
+from src.domain.specifications import Specification
+from src.domain.user.dtos import RefreshTokenDTO, RevokedTokenDTO, UserDTO, UsersPageDTO
 
 
 class IUserRepo(Protocol):
     async def create(self, user: UserDTO) -> UserDTO:
+        """:raises UserAlreadyExistsError: if the username is taken"""
         raise NotImplementedError
 
     async def find_by_username(self, username: str) -> UserDTO | None:
         raise NotImplementedError
+
+    async def exists(self, username: str) -> bool:
+        """Check if the user exists without loading it."""
+        raise NotImplementedError
+
+    async def get_password_hash(self, username: str) -> str | None:
+        """Get only the password hash of the user, None if there is no such user."""
+        raise NotImplementedError
+
+    async def find_existing_usernames(self, usernames: Collection[str]) -> set[str]:
+        """Get the subset of `usernames` that belong to existing users, in a single query."""
+        raise NotImplementedError
+
+    async def update(self, user: UserDTO) -> UserDTO:
+        """
+        Update the user. If `user.version` is set, only if the stored user still has that version.
+        :raises UserUpdateConflictError: if the user was changed since `user.version` was read
+        :return: The user with its new version
+        """
+        raise NotImplementedError
+
+    async def find_by(
+        self,
+        spec: Specification | None = None,
+        /,
+        *,
+        order_by: str | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+        **filters: Any,
+    ) -> list[UserDTO]:
+        """Get users matching `spec` and whose fields are equal to `filters`, e.g. `find_by(In("username", names))`."""
+        raise NotImplementedError
+
+    async def get_users_page(self, after: str | None, limit: int) -> UsersPageDTO:
+        """
+        Get users ordered by username, starting after the `after` cursor of the previous page.
+        :raises InvalidPageCursorError: if the cursor is malformed
+        """
+        raise NotImplementedError
+
+
+class IRevokedTokenRepo(Protocol):
+    async def create(self, token: RevokedTokenDTO) -> RevokedTokenDTO:
+        raise NotImplementedError
+
+    async def revoke(self, token: RevokedTokenDTO) -> None:
+        """Store the revoked token, doing nothing if it's already revoked."""
+        raise NotImplementedError
+
+    async def is_revoked(self, jti: str) -> bool:
+        raise NotImplementedError
+
+    async def get_active(self, now: datetime) -> list[RevokedTokenDTO]:
+        """Get revoked tokens that are not expired yet."""
+        raise NotImplementedError
+
+    async def get_revoked_since(self, since: datetime, now: datetime) -> list[RevokedTokenDTO]:
+        """Get not expired tokens revoked after `since`."""
+        raise NotImplementedError
+
+    async def delete_expired(self, now: datetime) -> None:
+        raise NotImplementedError
+
+
+class IRefreshTokenRepo(Protocol):
+    async def create(self, token: RefreshTokenDTO) -> RefreshTokenDTO:
+        raise NotImplementedError
+
+    async def get_by_id(self, token_hash: str) -> RefreshTokenDTO | None:
+        raise NotImplementedError
+
+    async def mark_used(self, token_hash: str, used_at: datetime) -> bool:
+        """Atomically mark a not yet used token as used. Returns False if it was already used."""
+        raise NotImplementedError
+
+    async def revoke_family(self, family_id: str, revoked_at: datetime) -> None:
+        raise NotImplementedError
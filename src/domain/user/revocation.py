@@ -0,0 +1,116 @@
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from src.domain.user.bloom import BloomFilter
+from src.domain.user.dtos import RevokedTokenDTO
+from src.domain.user.repos import IRevokedTokenRepo
+from src.settings import settings
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+class RevocationList:
+    """
+    In-process Bloom filter of revoked token IDs (`jti`), mirroring the revoked tokens table.
+
+    A token that is not in the filter is definitely not revoked, so the common case costs no I/O.
+    A hit may be a false positive and has to be confirmed by the repository.
+    Until the first sync succeeds every token is reported as possibly revoked.
+
+    The filter is kept up to date by `sync()`, which is expected to be called on a timer: it adds tokens
+    revoked since the previous sync. Expired tokens are left in the filter, which is rebuilt from scratch
+    dropping them at most once per `rebuild_interval` (or as soon as it outgrows its capacity).
+    Tokens revoked by other processes are therefore seen here after up to one sync interval.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_overlap: timedelta = timedelta(minutes=1),
+        rebuild_interval: timedelta = timedelta(hours=1),
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        """
+        :param capacity: Expected number of not yet expired revoked tokens
+        :param error_rate: Acceptable false positive probability
+        :param sync_overlap: How far back each incremental sync looks again, to catch late commits and clock skew
+        :param rebuild_interval: Minimum time between rebuilds dropping expired tokens
+        :param clock: Returns the current aware datetime
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_overlap = sync_overlap
+        self.rebuild_interval = rebuild_interval
+        self._clock = clock
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._added_while_rebuilding: list[RevokedTokenDTO] | None = None
+        self._synced_until: datetime | None = None
+        self._rebuilt_at: datetime | None = None
+        self._earliest_expiry: datetime | None = None
+
+    @property
+    def is_synced(self) -> bool:
+        return self._synced_until is not None
+
+    def might_be_revoked(self, jti: str) -> bool:
+        # Not synced yet (e.g. the DB was unreachable so far): every token has to be checked in the repository
+        if not self.is_synced:
+            return True
+        return jti in self._bloom
+
+    def add(self, token: RevokedTokenDTO) -> None:
+        """Add a revoked token, e.g. right after it is revoked in this process."""
+        self._bloom.add(token.jti)
+        if self._added_while_rebuilding is not None:
+            self._added_while_rebuilding.append(token)
+        if self._earliest_expiry is None or token.expires_at < self._earliest_expiry:
+            self._earliest_expiry = token.expires_at
+
+    async def sync(self, repo: IRevokedTokenRepo) -> None:
+        """Catch up with the revoked tokens table."""
+        now = self._clock()
+        if self._synced_until is None or self._needs_rebuild(now):
+            await self._rebuild(repo, now)
+            return
+
+        tokens = await repo.get_revoked_since(self._synced_until - self.sync_overlap, now)
+        for token in tokens:
+            self.add(token)
+        self._synced_until = max((token.revoked_at for token in tokens), default=self._synced_until)
+
+    async def _rebuild(self, repo: IRevokedTokenRepo, now: datetime) -> None:
+        # Tokens revoked in this process while the table is being read may be missing from it
+        added_while_rebuilding: list[RevokedTokenDTO] = []
+        self._added_while_rebuilding = added_while_rebuilding
+        try:
+            await repo.delete_expired(now)
+            tokens = await repo.get_active(now)
+        finally:
+            self._added_while_rebuilding = None
+        tokens = [*tokens, *added_while_rebuilding]
+
+        bloom = BloomFilter(max(self.capacity, 2 * len(tokens)), self.error_rate)
+        for token in tokens:
+            bloom.add(token.jti)
+
+        self._bloom = bloom
+        self._earliest_expiry = min((token.expires_at for token in tokens), default=None)
+        self._synced_until = max((token.revoked_at for token in tokens), default=now)
+        self._rebuilt_at = now
+
+    def _needs_rebuild(self, now: datetime) -> bool:
+        if len(self._bloom) > self._bloom.capacity:
+            return True
+        expired = self._earliest_expiry is not None and self._earliest_expiry <= now
+        # Access tokens are short-lived, so some token expires almost every sync: drop them in bulk
+        return expired and (self._rebuilt_at is None or now - self._rebuilt_at >= self.rebuild_interval)
+
+
+revocation_list = RevocationList(
+    capacity=settings.AUTH_REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.AUTH_REVOCATION_BLOOM_ERROR_RATE,
+    rebuild_interval=timedelta(seconds=settings.AUTH_REVOCATION_REBUILD_INTERVAL_SECONDS),
+)
@@ -0,0 +1,61 @@
+import sys
+import time
+from collections.abc import Callable, Hashable
+from hashlib import sha256
+from typing import Any
+
+from src.domain.cache import LRUCache
+from src.settings import settings
+
+
+class VerifiedTokenCache(LRUCache[str, dict[str, Any]]):
+    """
+    LRU cache of already verified token claims.
+
+    Entries are keyed by a SHA-256 digest of the token, so raw bearer tokens are never kept in memory.
+    An entry lives until the earlier of the token's `exp` claim and `ttl_seconds` after it was stored,
+    and the cache is bounded both by the number of entries and by their approximate size in bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        :param max_entries: Maximum number of cached tokens
+        :param max_bytes: Maximum approximate memory used by cached claims
+        :param ttl_seconds: Upper bound for an entry lifetime, applied even if `exp` is further away
+        :param clock: Wall clock returning epoch seconds, comparable with the `exp` claim
+        """
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes, clock=clock)
+
+    def invalidate(self, token: str) -> None:
+        """Drop the token from the cache if it is there."""
+        self.delete(token)
+
+    def _make_key(self, key: str) -> bytes:
+        return sha256(key.encode()).digest()
+
+    def _get_expires_at(self, value: dict[str, Any], now: float) -> float:
+        expires_at = now + self.ttl_seconds
+        exp = value.get("exp")
+        if isinstance(exp, int | float):
+            expires_at = min(expires_at, float(exp))
+        return expires_at
+
+    def _estimate_size(self, entry_key: Hashable, value: dict[str, Any]) -> int:
+        """Approximate memory used by an entry: the key, the claims dict and its items."""
+        size = sys.getsizeof(entry_key) + sys.getsizeof(value)
+        for name, item in value.items():
+            size += sys.getsizeof(name) + sys.getsizeof(item)
+        return size
+
+
+verified_token_cache = VerifiedTokenCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    max_bytes=settings.AUTH_TOKEN_CACHE_MAX_BYTES,
+    ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,111 @@
+from collections.abc import Mapping
+from typing import Any
+
+import jwt
+
+from src.settings import settings
+
+
+class TokenService:
+    """
+    Signs and verifies access tokens.
+
+    Key material, the algorithm allowlist and decode options are prepared once on creation,
+    so encoding and decoding a token doesn't unwrap secrets, parse keys or rebuild options on every call.
+
+    Symmetric (HS*) algorithms sign and verify with `secret_key`.
+    Asymmetric algorithms (EdDSA, RS256, ...) sign with the active private key from `signing_keys`
+    and put its ID into the `kid` header. Tokens are verified with the public key matching their `kid`,
+    which is either derived from one of `signing_keys` or taken from `verification_keys`.
+    Public keys are also published as a JWKS, so other services can verify tokens themselves.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str | bytes | None = None,
+        signing_keys: Mapping[str, str | bytes] | None = None,
+        active_key_id: str | None = None,
+        verification_keys: Mapping[str, str | bytes] | None = None,
+    ):
+        """
+        :param algorithm: Algorithm used for signing and the only one accepted for verification
+        :param secret_key: Key for symmetric algorithms
+        :param signing_keys: Private keys (PEM) for asymmetric algorithms by key ID
+        :param active_key_id: ID of the signing key for new tokens, required when there are several signing keys
+        :param verification_keys: Public keys (PEM) of retired signing keys by key ID, used only for verification
+        """
+        self.algorithm = algorithm
+        self.allowed_algorithms = [algorithm]
+        self.is_symmetric = algorithm.startswith("HS")
+        self._algorithm = jwt.get_algorithm_by_name(algorithm)
+        self._jwt = jwt.PyJWT(options={"verify_signature": True, "verify_exp": True})
+        self._headers: dict[str, Any] | None = None
+        self._verification_keys: dict[str | None, Any] = {}
+        self._jwks: dict[str, Any] = {"keys": []}
+
+        if self.is_symmetric:
+            if secret_key is None:
+                raise ValueError(f"Secret key is required for {algorithm}")
+            self._signing_key = self._algorithm.prepare_key(secret_key)
+            self._verification_keys[None] = self._signing_key
+            return
+
+        signing_keys = signing_keys or {}
+        if active_key_id is None and len(signing_keys) == 1:
+            active_key_id = next(iter(signing_keys))
+        if active_key_id is None or active_key_id not in signing_keys:
+            raise ValueError(f"Active signing key {active_key_id!r} is not configured for {algorithm}")
+
+        private_keys = {kid: self._algorithm.prepare_key(key) for kid, key in signing_keys.items()}
+        self._signing_key = private_keys[active_key_id]
+        self._headers = {"kid": active_key_id}
+        for kid, private_key in private_keys.items():
+            self._verification_keys[kid] = private_key.public_key()
+        for kid, public_key in (verification_keys or {}).items():
+            self._verification_keys.setdefault(kid, self._algorithm.prepare_key(public_key))
+        self._jwks = {"keys": [self._to_jwk(kid, key) for kid, key in self._verification_keys.items()]}
+
+    @property
+    def jwks(self) -> dict[str, Any]:
+        """Public verification keys as a JWK Set, empty for symmetric algorithms."""
+        return self._jwks
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        """Sign the payload into a token."""
+        return self._jwt.encode(payload, self._signing_key, algorithm=self.algorithm, headers=self._headers)
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """
+        Verify the token and return its claims.
+        :raises jwt.InvalidTokenError: if the token is malformed, expired or its signature doesn't match
+        """
+        return self._jwt.decode(token, self._get_verification_key(token), algorithms=self.allowed_algorithms)
+
+    def _get_verification_key(self, token: str) -> Any:
+        if self.is_symmetric:
+            return self._verification_keys[None]
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._verification_keys.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise jwt.InvalidSignatureError(f"Unknown signing key ID: {kid!r}")
+        return key
+
+    def _to_jwk(self, kid: str | None, public_key: Any) -> dict[str, Any]:
+        jwk: dict[str, Any] = self._algorithm.to_jwk(public_key, as_dict=True)
+        return {**jwk, "kid": kid, "alg": self.algorithm, "use": "sig"}
+
+
+def build_token_service() -> TokenService:
+    """Build the token service from the settings."""
+    return TokenService(
+        algorithm=settings.AUTH_HASH_ALGORITHM,
+        secret_key=settings.AUTH_SECRET_KEY.get_secret_value(),
+        signing_keys={kid: key.get_secret_value() for kid, key in settings.AUTH_SIGNING_KEYS.items()},
+        active_key_id=settings.AUTH_ACTIVE_SIGNING_KEY_ID,
+        verification_keys=settings.AUTH_VERIFICATION_KEYS,
+    )
+
+
+token_service = build_token_service()
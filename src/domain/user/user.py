@@ -1,84 +1,306 @@
-from datetime import timedelta, datetime, UTC
+import secrets
+from datetime import UTC, datetime, timedelta
 from hashlib import sha256
+from typing import Any
 
 import jwt
-from pydantic import SecretStr
+from pydantic import SecretStr, ValidationError
 
-from src.domain.user.dtos import CreateUserDTO, LoginUserDTO, UserDTO
-from src.domain.user.errors import InvalidPasswordError, UserAlreadyExistsError, UserDoesNotExistError
-from src.domain.user.repos import IUserRepo
+from src.domain.user.dtos import (
+    CreateUserDTO,
+    LoginUserDTO,
+    RefreshTokenDTO,
+    RevokedTokenDTO,
+    TokenIntrospectionDTO,
+    TokenPairDTO,
+    UserDTO,
+    UserIdentityDTO,
+    UsersPageDTO,
+)
+from src.domain.user.errors import (
+    InvalidPasswordError,
+    InvalidRefreshTokenError,
+    RefreshTokenReuseError,
+    UserDoesNotExistError,
+)
+from src.domain.user.hash_executor import PasswordHashExecutor, password_hash_executor
+from src.domain.user.hashers import PasswordHasher, password_hasher
+from src.domain.user.repos import IRefreshTokenRepo, IRevokedTokenRepo, IUserRepo
+from src.domain.user.revocation import RevocationList, revocation_list
+from src.domain.user.token_cache import VerifiedTokenCache, verified_token_cache
+from src.domain.user.tokens import TokenService, token_service
 from src.settings import settings
 
 
 class User:
-    def __init__(self, repo: IUserRepo):
+    def __init__(
+        self,
+        repo: IUserRepo,
+        revoked_tokens_repo: IRevokedTokenRepo | None = None,
+        refresh_tokens_repo: IRefreshTokenRepo | None = None,
+        token_cache: VerifiedTokenCache | None = None,
+        hash_executor: PasswordHashExecutor | None = None,
+        hasher: PasswordHasher | None = None,
+        tokens: TokenService | None = None,
+        revocations: RevocationList | None = None,
+    ):
         self._repo = repo
+        self._revoked_tokens_repo = revoked_tokens_repo
+        self._refresh_tokens_repo = refresh_tokens_repo
+        self._revocations = revocations or revocation_list
+        self._tokens = tokens or token_service
+        self._hash_executor = hash_executor or password_hash_executor
+        self._hasher = hasher or password_hasher
+        if token_cache is None and settings.AUTH_TOKEN_CACHE_ENABLED:
+            token_cache = verified_token_cache
+        self._token_cache = token_cache
 
     async def create(self, create_data: CreateUserDTO) -> UserDTO:
-        existed_user = await self.find_by_username(create_data.username)
-        if existed_user:
-            raise UserAlreadyExistsError("User with this username already exists.")
-
-        password_hash = self._get_password_hash(create_data.password)
+        """
+        Create a user in a single round trip.
+        :raises UserAlreadyExistsError: raised by the repository if the username is taken
+        """
+        password_hash = await self._hash_password(create_data.password)
         return await self._repo.create(UserDTO(username=create_data.username, password_hash=password_hash))
 
     async def login(self, login_data: LoginUserDTO) -> str:
-        user = await self.find_by_username(login_data.username)
-        if not user:
-            raise UserDoesNotExistError("User with this username does not exist.")
-        if not self._verify_password(login_data.password, user.password_hash):
-            raise InvalidPasswordError
+        user = await self._authenticate(login_data)
+        return self._create_access_token(user)
+
+    async def login_with_refresh_token(self, login_data: LoginUserDTO) -> TokenPairDTO:
+        """Log in, getting a short-lived access token and a refresh token starting a new rotation family."""
+        user = await self._authenticate(login_data)
+        family_id = secrets.token_urlsafe(16)
+        return TokenPairDTO(
+            access_token=self._create_access_token(user, family_id=family_id),
+            refresh_token=await self._create_refresh_token(user.username, family_id=family_id),
+        )
+
+    async def refresh(self, refresh_token: str) -> TokenPairDTO:
+        """
+        Exchange a refresh token for a new token pair. Every refresh token can be used only once:
+        presenting an already used one means it has leaked, so its whole family gets revoked.
+        """
+        if self._refresh_tokens_repo is None:
+            raise RuntimeError("Refresh tokens repository is required to refresh tokens.")
 
-        return self._create_access_token(login_data.username)
+        now = datetime.now(UTC)
+        token_hash = self._hash_refresh_token(refresh_token)
+        stored = await self._refresh_tokens_repo.get_by_id(token_hash)
+        if stored is None or stored.revoked_at is not None or stored.expires_at <= now:
+            raise InvalidRefreshTokenError("Refresh token is invalid or expired.")
+        if stored.used_at is not None or not await self._refresh_tokens_repo.mark_used(token_hash, now):
+            await self._refresh_tokens_repo.revoke_family(stored.family_id, now)
+            raise RefreshTokenReuseError("Refresh token has already been used.")
+
+        if not await self._repo.exists(stored.username):
+            raise InvalidRefreshTokenError("User with this username does not exist.")
+        user = UserIdentityDTO(username=stored.username)
+
+        return TokenPairDTO(
+            access_token=self._create_access_token(user, family_id=stored.family_id),
+            refresh_token=await self._create_refresh_token(user.username, family_id=stored.family_id),
+        )
 
     async def find_by_username(self, username: str) -> UserDTO | None:
         return await self._repo.find_by_username(username)
 
+    async def list_users(
+        self,
+        after: str | None = None,
+        limit: int = settings.USERS_PAGE_DEFAULT_LIMIT,
+    ) -> UsersPageDTO:
+        """
+        Get a page of users ordered by username.
+        :param after: `next_cursor` of the previous page, None for the first page
+        :raises InvalidPageCursorError: if the cursor is malformed
+        """
+        return await self._repo.get_users_page(after=after, limit=limit)
+
+    async def get_current_identity(self, token: str) -> UserIdentityDTO:
+        """
+        Get the identity of the current user.
+        With stateless tokens enabled it is taken from the verified token claims without a DB lookup,
+        tokens issued without the identity claim fall back to get_current().
+        """
+        payload = await self._get_access_token_payload(token)
+        if settings.AUTH_STATELESS_TOKENS:
+            identity = payload.get(settings.AUTH_ACCESS_TOKEN_USER_FIELD)
+            if identity is not None:
+                try:
+                    return UserIdentityDTO.model_validate(identity)
+                except ValidationError as e:
+                    raise UserDoesNotExistError("Invalid token payload.") from e
+
+        return await self._get_user_by_payload(payload)
+
     async def get_current(self, token: str) -> UserDTO:
-        try:
-            print("********\n" * 10)
-            print(token)
-            payload = jwt.decode(
-                token,
-                settings.AUTH_SECRET_KEY.get_secret_value(),
-                algorithms=[settings.AUTH_HASH_ALGORITHM],
+        """Get the current user from the DB."""
+        payload = await self._get_access_token_payload(token)
+        return await self._get_user_by_payload(payload)
+
+    async def introspect(self, tokens: list[str]) -> list[TokenIntrospectionDTO]:
+        """
+        Validate a batch of access tokens, e.g. for an API gateway.
+        Tokens are verified one by one in memory, then their users are checked with a single query.
+        Results are in the order of `tokens`, invalid ones are reported as inactive.
+        """
+        payloads: list[dict[str, Any] | None] = []
+        for token in tokens:
+            try:
+                payloads.append(await self._get_access_token_payload(token))
+            except UserDoesNotExistError:
+                payloads.append(None)
+
+        usernames = {
+            payload[settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD]
+            for payload in payloads
+            if payload is not None and isinstance(payload.get(settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD), str)
+        }
+        existing_usernames = await self._repo.find_existing_usernames(usernames) if usernames else set()
+
+        results = []
+        for payload in payloads:
+            username = payload.get(settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD) if payload is not None else None
+            if payload is None or username not in existing_usernames:
+                results.append(TokenIntrospectionDTO(active=False))
+                continue
+            exp = payload.get("exp")
+            results.append(
+                TokenIntrospectionDTO(
+                    active=True,
+                    username=username,
+                    expires_at=datetime.fromtimestamp(exp, UTC) if isinstance(exp, int | float) else None,
+                ),
             )
-            username = payload.get(settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD)
-            if not username:
-                raise UserDoesNotExistError("Invalid token payload.")
-
-            user = await self.find_by_username(username)
-            if user is None:
-                raise UserDoesNotExistError("User with this username does not exist.")
-            return user
-        except jwt.InvalidTokenError as e:
-            print(e)
+        return results
+
+    async def logout(self, token: str) -> None:
+        """Revoke the access token until it expires."""
+        payload = await self._get_access_token_payload(token)
+        jti = payload.get("jti")
+        exp = payload.get("exp")
+        if not jti or not isinstance(exp, int | float):
+            raise UserDoesNotExistError("Token can't be revoked.")
+        if self._revoked_tokens_repo is None:
+            raise RuntimeError("Revoked tokens repository is required to revoke tokens.")
+
+        revoked_token = RevokedTokenDTO(
+            jti=jti,
+            expires_at=datetime.fromtimestamp(exp, UTC),
+            revoked_at=datetime.now(UTC),
+        )
+        # Idempotent: a concurrent logout with the same token may have revoked it already
+        await self._revoked_tokens_repo.revoke(revoked_token)
+        self._revocations.add(revoked_token)
+        if self._token_cache is not None:
+            self._token_cache.invalidate(token)
+
+        family_id = payload.get("fid")
+        if family_id and self._refresh_tokens_repo is not None:
+            await self._refresh_tokens_repo.revoke_family(family_id, revoked_token.revoked_at)
+
+    async def _authenticate(self, login_data: LoginUserDTO) -> UserIdentityDTO:
+        password_hash = await self._repo.get_password_hash(login_data.username)
+        if password_hash is None:
+            raise UserDoesNotExistError("User with this username does not exist.")
+        if not await self._verify_password(login_data.password, password_hash):
+            raise InvalidPasswordError
+        if self._hasher.needs_rehash(password_hash):
+            await self._rehash_password(login_data.username, login_data.password)
+        return UserIdentityDTO(username=login_data.username)
+
+    async def _get_user_by_payload(self, payload: dict[str, Any]) -> UserDTO:
+        username = payload.get(settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD)
+        if not username:
             raise UserDoesNotExistError("Invalid token payload.")
 
-    def _verify_password(self, password_to_check: SecretStr, actual_password_hash: SecretStr) -> bool:
+        user = await self.find_by_username(username)
+        if user is None:
+            raise UserDoesNotExistError("User with this username does not exist.")
+        return user
+
+    async def _get_access_token_payload(self, token: str) -> dict[str, Any]:
+        """Get claims of a valid and not revoked access token."""
+        payload = self._decode_access_token(token)
+        jti = payload.get("jti")
+        if jti is not None and await self._is_revoked(jti):
+            raise UserDoesNotExistError("Token has been revoked.")
+        return payload
+
+    async def _is_revoked(self, jti: str) -> bool:
+        """Check the revocation Bloom filter, confirming its hits (possible false positives) in the repository."""
+        if not self._revocations.might_be_revoked(jti):
+            return False
+        if self._revoked_tokens_repo is None:
+            return True
+        return await self._revoked_tokens_repo.is_revoked(jti)
+
+    def _decode_access_token(self, token: str) -> dict[str, Any]:
+        """Verify the token and return its claims, reusing claims of already verified tokens."""
+        if self._token_cache is not None:
+            cached_payload = self._token_cache.get(token)
+            if cached_payload is not None:
+                return cached_payload
+
+        try:
+            payload = self._tokens.decode(token)
+        except jwt.InvalidTokenError as e:
+            raise UserDoesNotExistError("Invalid token payload.") from e
+
+        if self._token_cache is not None:
+            self._token_cache.set(token, payload)
+        return payload
+
+    async def _verify_password(self, password_to_check: SecretStr, actual_password_hash: str) -> bool:
         """Verify if the provided password matches the stored hash."""
-        password_hash_to_check = self._get_password_hash(password_to_check)
-        return password_hash_to_check == actual_password_hash.get_secret_value()
+        return await self._hash_executor.run(
+            self._hasher.verify,
+            password_to_check.get_secret_value(),
+            actual_password_hash,
+        )
 
-    @staticmethod
-    def _get_password_hash(password: SecretStr) -> str:
-        """Generate a hashed password."""
-        pwd_bytes = password.get_secret_value().encode()
-        salt = settings.AUTH_PASSWORD_SALT.get_secret_value().encode()
+    async def _hash_password(self, password: SecretStr) -> str:
+        """Hash the password in the hashing executor, keeping the event loop free."""
+        return await self._hash_executor.run(self._hasher.hash, password.get_secret_value())
 
-        hasher = sha256()
-        hasher.update(pwd_bytes + salt)
-        return hasher.hexdigest()
+    async def _rehash_password(self, username: str, password: SecretStr) -> None:
+        """Replace an outdated hash (another algorithm or cost) of the just verified password."""
+        password_hash = await self._hash_password(password)
+        await self._repo.update(UserDTO(username=username, password_hash=password_hash))
 
-    @staticmethod
-    def _create_access_token(username: str) -> str:
+    def _create_access_token(self, user: UserIdentityDTO, family_id: str | None = None) -> str:
         access_token_expires_delta = timedelta(minutes=settings.AUTH_ACCESS_TOKEN_EXPIRE_MINUTES)
-        data = {
-            settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD: username,
+        data: dict[str, Any] = {
+            settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD: user.username,
             "exp": datetime.now(UTC) + access_token_expires_delta,
+            "jti": secrets.token_urlsafe(16),
         }
-        return jwt.encode(
-            data,
-            settings.AUTH_SECRET_KEY.get_secret_value(),
-            algorithm=settings.AUTH_HASH_ALGORITHM,
+        if settings.AUTH_STATELESS_TOKENS:
+            # Dump only identity fields, `user` may be a UserDTO carrying the password hash
+            identity_fields = set(UserIdentityDTO.model_fields)
+            data[settings.AUTH_ACCESS_TOKEN_USER_FIELD] = user.model_dump(mode="json", include=identity_fields)
+        if family_id is not None:
+            # Lets logout revoke the refresh tokens issued along with the access token
+            data["fid"] = family_id
+        return self._tokens.encode(data)
+
+    async def _create_refresh_token(self, username: str, family_id: str) -> str:
+        if self._refresh_tokens_repo is None:
+            raise RuntimeError("Refresh tokens repository is required to issue refresh tokens.")
+
+        token = secrets.token_urlsafe(32)
+        await self._refresh_tokens_repo.create(
+            RefreshTokenDTO(
+                token_hash=self._hash_refresh_token(token),
+                family_id=family_id,
+                username=username,
+                expires_at=datetime.now(UTC) + timedelta(days=settings.AUTH_REFRESH_TOKEN_EXPIRE_DAYS),
+            ),
         )
+        return token
+
+    @staticmethod
+    def _hash_refresh_token(token: str) -> str:
+        """Refresh tokens are random 256-bit strings, so a plain SHA-256 is enough to store them safely."""
+        return sha256(token.encode()).hexdigest()
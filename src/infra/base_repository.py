@@ -1,12 +1,29 @@
+import base64
+import binascii
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from collections import defaultdict
+from collections.abc import AsyncIterator, Collection, Hashable, Iterable, Sequence
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
+from itertools import batched
+from typing import Any, Generic, TypeVar, cast
 
-from sqlalchemy import select
+import pydantic_core
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import ColumnElement, Select, Table, bindparam, event, exists, func, literal, select, tuple_
+from sqlalchemy import delete as sa_delete
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy import update as sa_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
+from src.domain.specifications import And, Eq, Specification
 from src.infra.db import DBBaseModel
+from src.infra.entity_cache import IEntityCache
+from src.infra.specifications import build_where_clause, get_spec_shape
 
 
 DBModel = TypeVar("DBModel", bound=DBBaseModel)
@@ -14,18 +31,113 @@ DTO = TypeVar("DTO")
 IDType = TypeVar("IDType")
 
 
+@dataclass(slots=True)
+class CreateManyResult(Generic[DTO, IDType]):
+    """Outcome of `BaseRepository.create_many()`."""
+
+    created: list[DTO] = field(default_factory=list)
+    # IDs of the entities that were not created because of a conflict, in the input order
+    conflicted_ids: list[IDType] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Page(Generic[DTO]):
+    """A page of `BaseRepository.get_page()`."""
+
+    items: list[DTO]
+    # Opaque cursor to pass as `after` to get the next page, None on the last page
+    next_cursor: str | None
+
+
+class InvalidCursorError(ValueError):
+    """Page cursor is malformed or was issued for another ordering."""
+
+
+# Session.info key of the cache keys of entities written in the current transaction, by cache
+_PENDING_INVALIDATIONS = "entity_cache_pending_invalidations"
+# Name of the ID parameter of bulk updates, distinct from the column names so the ID isn't SET
+_ID_PARAM = "_id"
+
+
+def _invalidate_pending(session: Session) -> None:
+    """Drop the entities written in the just finished transaction from the caches."""
+    pending: dict[IEntityCache, set[Hashable]] = session.info.pop(_PENDING_INVALIDATIONS, {})
+    for entity_cache, keys in pending.items():
+        entity_cache.delete_many(keys)
+
+
+@cache
+def _get_type_adapter(python_type: type) -> TypeAdapter[Any]:
+    return TypeAdapter(python_type)
+
+
+# Statements are built once per query shape, so repeated shapes reuse the statement object with its
+# memoized cache key and go straight to the compiled statement cache, like a `lambda_stmt()` would
+@lru_cache(maxsize=1024)
+def _get_find_statement(
+    model_class: type[DBBaseModel],
+    bypass_orm: bool,
+    shape: Hashable | None,
+    order_by: tuple[str, ...],
+    descending: bool,
+    limited: bool,
+) -> Select[Any]:
+    stmt = select(*model_class.__table__.columns) if bypass_orm else select(model_class)
+    if shape is not None:
+        stmt = stmt.where(build_where_clause(model_class, shape))
+    for name in order_by:
+        if name not in sa_inspect(model_class).columns:
+            raise ValueError(f"{model_class.__name__} has no field {name}")
+        column = getattr(model_class, name)
+        stmt = stmt.order_by(column.desc() if descending else column.asc())
+    if limited:
+        stmt = stmt.limit(bindparam("limit"))
+    return stmt
+
+
+@lru_cache(maxsize=1024)
+def _get_count_statement(model_class: type[DBBaseModel], shape: Hashable | None) -> Select[Any]:
+    stmt = select(func.count()).select_from(model_class)
+    if shape is not None:
+        stmt = stmt.where(build_where_clause(model_class, shape))
+    return stmt
+
+
 class BaseRepository(Generic[DBModel, DTO, IDType], ABC):
     """
     Repository mixin with common methods for all repositories:
     - get_by_id(id: IDType) -> DTO | None
+    - get_many(ids: Iterable[IDType]) -> list[DTO | None]
+    - exists(id: IDType) -> bool
+    - count(spec: Specification | None, **filters: Any) -> int
+    - find_by(spec: Specification | None, order_by: ..., descending: ..., limit: ..., **filters: Any) -> list[DTO]
     - get_all() -> list[DTO]
+    - stream_all(yield_per: int | None) -> AsyncIterator[DTO]
+    - get_page(after: str | None, limit: int, order_by: str | None, descending: bool) -> Page[DTO]
     - create(dto: DTO) -> DTO
-    - update(dto: DTO) -> DTO
+    - create_many(dtos: Iterable[DTO]) -> CreateManyResult[DTO, IDType]
+    - update(dto: DTO, fields: Collection[str] | None) -> DTO
+    - update_many(dtos: Iterable[DTO], fields: Collection[str] | None) -> None
+    - upsert(dto: DTO, conflict_fields: Collection[str] | None, update_fields: Collection[str] | None) -> DTO
+    - upsert_many(dtos: Iterable[DTO], conflict_fields: ..., update_fields: ...) -> list[DTO]
     - delete(id: IDType) -> None
+    - delete_many(ids: Iterable[IDType], missing_ok: bool) -> list[IDType]
 
     To use this mixin, inherit from it and implement the methods
     - map_model_to_dto() method to map DBModel fields to DTO fields
     - map_dto_to_model() method to map DTO fields to DBModel fields
+
+    With `bypass_orm` reads select plain columns with Core and build DTOs straight from the rows
+    (see `map_row_to_dto()`), skipping ORM instances and the identity map. Meant for read-only traffic.
+
+    With a `cache`, get_by_id() and get_many() read through it. Entities written by the repository
+    are dropped from the cache when the transaction commits (or rolls back), and until then the session
+    that wrote them reads them from the DB. A read racing with a commit in another session may still cache
+    the old state, so the cache TTL bounds staleness.
+
+    With a `version_field` writes increment the entity version, and update() and upsert() of a DTO
+    carrying the version it was read at fail with `conflict_exception_class` if the entity has changed since.
+    Concurrent read-modify-write cycles then need no locks: the losing writer re-reads and retries.
     """
 
     def __init__(
@@ -35,6 +147,11 @@ class BaseRepository(Generic[DBModel, DTO, IDType], ABC):
         id_field: str = "id",
         already_exists_exception_class: type[Exception] = IntegrityError,
         not_found_exception_class: type[Exception] = NoResultFound,
+        chunk_size: int = 1000,
+        bypass_orm: bool = False,
+        cache: IEntityCache | None = None,
+        version_field: str | None = None,
+        conflict_exception_class: type[Exception] = StaleDataError,
     ):
         """
         Initialize the repository with a session and model class.
@@ -43,12 +160,24 @@ class BaseRepository(Generic[DBModel, DTO, IDType], ABC):
         :param id_field: Name of the ID (PK) field in the model class
         :param already_exists_exception_class: Exception class for already exists error
         :param not_found_exception_class: Exception class for not found error
+        :param chunk_size: Max number of entities sent in one statement by bulk methods
+        :param bypass_orm: Read rows with Core instead of loading ORM entities
+        :param cache: Read-through cache of DTOs by ID
+        :param version_field: Name of the integer version field for optimistic concurrency, not versioned by default
+        :param conflict_exception_class: Exception class for a write to an entity changed since its version was read
         """
         self.session = session
         self.model = model_class
         self.id_field = id_field
         self.already_exists_exception_class = already_exists_exception_class
         self.not_found_exception_class = not_found_exception_class
+        self.chunk_size = chunk_size
+        self.bypass_orm = bypass_orm
+        self.cache = cache
+        self.version_field = version_field
+        self.conflict_exception_class = conflict_exception_class
+        self._columns_select = select(*model_class.__table__.columns)
+        self._map_read = self.map_row_to_dto if bypass_orm else self.map_model_to_dto
 
     @abstractmethod
     def map_model_to_dto(self, model: Any) -> Any:  # noqa
@@ -60,69 +189,559 @@ class BaseRepository(Generic[DBModel, DTO, IDType], ABC):
         """Map DTO to DBModel."""
         raise NotImplementedError
 
+    def map_row_to_dto(self, row: Any) -> Any:
+        """
+        Map a row of `bypass_orm` reads to DTO. Rows expose their columns as attributes like models do,
+        so by default this is `map_model_to_dto()`; override it for a mapping specialized for rows.
+        """
+        return self.map_model_to_dto(row)
+
     async def get_by_id(self, entity_id: IDType) -> DTO | None:
         """Get an entity by ID."""
+        cached: DTO | None = self._get_cached(entity_id)
+        if cached is not None:
+            return cached
+
+        dto = await self._load_by_id(entity_id)
+        if dto is not None:
+            self._set_cached(entity_id, dto)
+        return dto
+
+    async def _load_by_id(self, entity_id: IDType) -> DTO | None:
+        if self.bypass_orm:
+            resp = await self.session.execute(
+                self._columns_select.where(getattr(self.model, self.id_field) == entity_id),
+            )
+            row = resp.one_or_none()
+            return self.map_row_to_dto(row) if row is not None else None
+
         try:
             entity = await self.session.get_one(self.model, entity_id)
             return self.map_model_to_dto(entity) if entity else None
         except NoResultFound:
             return None
 
+    async def get_many(self, entity_ids: Iterable[IDType]) -> list[DTO | None]:
+        """
+        Get entities by IDs, in the order of `entity_ids`, with None for the missing ones.
+        Entities already loaded into the session are reused, the rest are fetched by chunked
+        `WHERE id IN (...)` queries, each distinct ID at most once.
+        """
+        entity_ids = list(entity_ids)
+        dtos: dict[IDType, DTO] = {}
+        found: dict[IDType, Any] = {}
+        to_fetch: list[IDType] = []
+        for entity_id in dict.fromkeys(entity_ids):
+            cached = self._get_cached(entity_id)
+            if cached is not None:
+                dtos[entity_id] = cached
+                continue
+            entity = None if self.bypass_orm else self._get_loaded(entity_id)
+            if entity is None:
+                to_fetch.append(entity_id)
+            else:
+                found[entity_id] = entity
+
+        id_column = getattr(self.model, self.id_field)
+        for chunk in batched(to_fetch, self.chunk_size):
+            entities = await self._fetch_for_read(self._select_for_read().where(id_column.in_(chunk)))
+            found.update((getattr(entity, self.id_field), entity) for entity in entities)
+
+        for entity_id, entity in found.items():
+            dtos[entity_id] = dto = self._map_read(entity)
+            self._set_cached(entity_id, dto)
+        return [dtos.get(entity_id) for entity_id in entity_ids]
+
+    async def exists(self, entity_id: IDType) -> bool:
+        """Check if an entity exists with SELECT EXISTS, without loading it."""
+        resp = await self.session.execute(select(exists().where(getattr(self.model, self.id_field) == entity_id)))
+        return bool(resp.scalar())
+
+    async def count(self, spec: Specification | None = None, /, **filters: Any) -> int:
+        """Count entities matching `spec` and whose fields are equal to `filters`, all of them without criteria."""
+        shape, params = self._get_spec_shape(spec, filters)
+        resp = await self.session.execute(_get_count_statement(self.model, shape), params)
+        return int(resp.scalar_one())
+
+    async def find_by(
+        self,
+        spec: Specification | None = None,
+        /,
+        *,
+        order_by: str | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+        **filters: Any,
+    ) -> list[DTO]:
+        """
+        Get entities matching `spec` and whose fields are equal to `filters`.
+        Queries of the same shape (fields, operators and options, but not values) share one prebuilt statement.
+        :param spec: Specification the entities must satisfy
+        :param order_by: Field to order by, the ID breaks ties. Unordered by default
+        :param descending: Order from the largest values
+        :param limit: Max number of entities to get
+        """
+        shape, params = self._get_spec_shape(spec, filters)
+        fields = (order_by, self.id_field) if order_by is not None and order_by != self.id_field else (order_by,)
+        stmt = _get_find_statement(
+            self.model,
+            self.bypass_orm,
+            shape,
+            fields if order_by is not None else (),
+            descending,
+            limit is not None,
+        )
+        if limit is not None:
+            params["limit"] = limit
+        entities = await self._fetch_for_read(stmt, params)
+        return [self._map_read(entity) for entity in entities]
+
     async def get_all(self) -> list[DTO]:
-        """Get all entities."""
-        resp = await self.session.execute(select(self.model))
-        entities = resp.scalars().all()
-        return [self.map_model_to_dto(entity) for entity in entities]
+        """Get all entities. Loads the whole table into memory, use `stream_all()` for large tables."""
+        entities = await self._fetch_for_read(self._select_for_read())
+        return [self._map_read(entity) for entity in entities]
+
+    async def stream_all(self, yield_per: int | None = None) -> AsyncIterator[DTO]:
+        """
+        Iterate over all entities with a server-side cursor, fetching `yield_per` rows at a time
+        (`chunk_size` by default) and mapping them to DTOs lazily, so memory use doesn't depend on the table size.
+        The cursor is closed when the iterator is closed. A consumer stopping early should close it right away
+        (e.g. with `contextlib.aclosing()`), otherwise it's closed once the event loop finalizes the dropped iterator.
+        """
+        stmt = self._select_for_read().execution_options(yield_per=yield_per or self.chunk_size)
+        entities = await (self.session.stream(stmt) if self.bypass_orm else self.session.stream_scalars(stmt))
+        try:
+            async for entity in entities:
+                yield self._map_read(entity)
+        finally:
+            await entities.close()
+
+    async def get_page(
+        self,
+        after: str | None = None,
+        limit: int = 50,
+        order_by: str | None = None,
+        descending: bool = False,
+    ) -> Page[DTO]:
+        """
+        Get a page of entities with keyset (seek) pagination: rather than skipping OFFSET rows, the query
+        continues right after the last row of the previous page, so any page costs O(limit) on an index.
+        :param after: `next_cursor` of the previous page, None for the first page
+        :param limit: Max number of entities in the page
+        :param order_by: Field to order by, the ID field by default. The ID breaks ties,
+            so ordering by another field needs an index on (field, ID)
+        :param descending: Order from the largest values
+        :raises InvalidCursorError: if `after` is malformed or was issued for another ordering
+        """
+        order_field = order_by or self.id_field
+        if order_field not in sa_inspect(self.model).columns:
+            raise ValueError(f"{self.model.__name__} has no field {order_field}")
+        fields = [order_field, self.id_field] if order_field != self.id_field else [self.id_field]
+        columns = [getattr(self.model, field) for field in fields]
+
+        stmt = self._select_for_read()
+        if after is not None:
+            key = self._decode_cursor(after, fields, descending)
+            row = tuple_(*columns) if len(columns) > 1 else columns[0]
+            bound = tuple_(*key) if len(key) > 1 else key[0]
+            stmt = stmt.where(row < bound if descending else row > bound)
+        stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column in columns))
+
+        # One extra row tells whether there is a next page
+        entities = list(await self._fetch_for_read(stmt.limit(limit + 1)))
+        next_cursor = None
+        if len(entities) > limit:
+            entities = entities[:limit]
+            next_cursor = self._encode_cursor([getattr(entities[-1], field) for field in fields], fields, descending)
+        return Page(items=[self._map_read(entity) for entity in entities], next_cursor=next_cursor)
 
     async def create(self, dto: DTO) -> DTO:
-        """Create a new entity."""
+        """
+        Create a new entity in a single round trip: INSERT ... ON CONFLICT DO NOTHING RETURNING.
+        A conflict on any unique constraint raises `already_exists_exception_class`.
+        """
         entity = self.map_dto_to_model(dto)
-        existed = await self.get_by_id(getattr(entity, self.id_field))
-        if existed:
+        resp = await self.session.scalars(
+            pg_insert(self.model)
+            .values(**self._get_insert_values_dict(entity))
+            .on_conflict_do_nothing()
+            .returning(self.model),
+        )
+        created = resp.one_or_none()
+        if created is None:
             raise self.already_exists_exception_class(
                 f"{self.model.__name__} with ID {getattr(entity, self.id_field)} already exists",
             )
-        # Use merge instead of add to handle existing nested objects
-        entity = await self.session.merge(entity)
-        try:
-            await self.session.flush()
-            res: DTO = self.map_model_to_dto(entity)
-            return res
-        except IntegrityError as e:
-            await self.session.rollback()
-            raise self.already_exists_exception_class(
-                f"{self.model.__name__} with ID {getattr(entity, self.id_field)} already exists",
-            ) from e
+        self._invalidate_cached([getattr(created, self.id_field)])
+        res: DTO = self.map_model_to_dto(created)
+        return res
 
-    async def update(self, dto: DTO) -> DTO:
-        """Update an existing entity."""
+    async def create_many(self, dtos: Iterable[DTO]) -> CreateManyResult[DTO, IDType]:
+        """
+        Create entities in bulk: one multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING per chunk.
+        Entities conflicting with existing rows (or repeated in `dtos`) are skipped and reported
+        in `conflicted_ids` instead of raising. Created entities are returned in the input order.
+        """
+        result: CreateManyResult[DTO, IDType] = CreateManyResult()
+        for chunk in batched(dtos, self.chunk_size):
+            entities = [self.map_dto_to_model(dto) for dto in chunk]
+            resp = await self.session.scalars(
+                pg_insert(self.model).on_conflict_do_nothing().returning(self.model),
+                [self._get_insert_values_dict(entity) for entity in entities],
+            )
+            created = {getattr(entity, self.id_field): entity for entity in resp}
+            self._invalidate_cached(created)
+            for entity in entities:
+                entity_id = getattr(entity, self.id_field)
+                if entity_id in created:
+                    result.created.append(self.map_model_to_dto(created.pop(entity_id)))
+                else:
+                    result.conflicted_ids.append(entity_id)
+        return result
+
+    async def update(self, dto: DTO, fields: Collection[str] | None = None) -> DTO:
+        """
+        Update an existing entity, writing only `fields` (all but the primary key by default).
+        Without `fields`, if the entity is loaded in the session, fields that already have the new values there
+        are not written, and if none has changed there is no UPDATE at all. The loaded entity is compared as it
+        was read: a field another transaction has changed since is not written if the DTO has the value it was
+        read with. So only rely on it for entities loaded in this transaction, or pass `fields` to write them.
+
+        With a `version_field` the version is incremented, and if the DTO has a version the row is updated
+        only if it still has it: UPDATE ... WHERE id = :id AND version = :version. Such an update always
+        checks the row, the fields are written without comparing them with the entity loaded in the session,
+        which may be stale.
+        :raises conflict_exception_class: if the entity was changed since its version was read
+        :return: The DTO, with the new version if versioned
+        """
         entity = self.map_dto_to_model(dto)
-        update_values = self._get_update_values_dict(entity)
-        resp = await self.session.execute(
-            sa_update(self.model)
-            .where(getattr(self.model, self.id_field) == getattr(entity, self.id_field))
-            .values(**update_values),
+        entity_id = getattr(entity, self.id_field)
+        expected_version = getattr(entity, self.version_field) if self.version_field is not None else None
+        update_values = self._get_update_values_dict(
+            entity,
+            fields,
+            skip_unchanged=fields is None and expected_version is None,
         )
-        await self.session.flush()
-        if resp.rowcount == 0:
+        if not update_values and expected_version is None:
+            # Nothing to write: nothing has changed, or no `fields`
+            if self.version_field is None:
+                return dto
+            if (loaded := self._get_loaded(entity_id)) is not None:
+                setattr(entity, self.version_field, getattr(loaded, self.version_field))
+                res: DTO = self.map_model_to_dto(entity)
+                return res
+
+        id_column = getattr(self.model, self.id_field)
+        stmt = sa_update(self.model).where(id_column == entity_id)
+        returning = [id_column]
+        if self.version_field is not None:
+            version_column = getattr(self.model, self.version_field)
+            if expected_version is not None:
+                stmt = stmt.where(version_column == expected_version)
+            update_values[self.version_field] = version_column + 1
+            returning.append(version_column)
+        resp = await self.session.execute(stmt.values(**update_values).returning(*returning))
+        row = resp.one_or_none()
+        if row is None:
+            if expected_version is not None and await self.exists(entity_id):
+                raise self._get_conflict_error(entity_id, expected_version)
             raise self.not_found_exception_class(
-                f"{self.model.__name__} with ID {getattr(entity, self.id_field)} not found for update",
+                f"{self.model.__name__} with ID {entity_id} not found for update",
             )
+        self._invalidate_cached([entity_id])
+        if self.version_field is not None:
+            setattr(entity, self.version_field, row[1])
+            dto = self.map_model_to_dto(entity)
         return dto
 
+    async def update_many(self, dtos: Iterable[DTO], fields: Collection[str] | None = None) -> None:
+        """
+        Update existing entities in bulk, writing the same fields as `update()` would without a version.
+        Entities are grouped by the set of columns they change and every group is sent as executemany
+        UPDATE ... WHERE id = :id batches of `chunk_size` rows. Entities without a row are skipped.
+        Versions are incremented but not checked, use `update()` to update an entity of a known version.
+        """
+        rows_by_columns: defaultdict[frozenset[str], list[dict[str, Any]]] = defaultdict(list)
+        for dto in dtos:
+            entity = self.map_dto_to_model(dto)
+            update_values = self._get_update_values_dict(entity, fields, skip_unchanged=fields is None)
+            if update_values:
+                update_values[_ID_PARAM] = getattr(entity, self.id_field)
+                rows_by_columns[frozenset(update_values)].append(update_values)
+
+        # A Core UPDATE rather than the ORM bulk UPDATE by primary key: the ORM checks the matched row count
+        # of single-row batches only, so an entity without a row would fail or be skipped depending on batching
+        table = cast(Table, self.model.__table__)
+        stmt = sa_update(table).where(table.c[self.id_field] == bindparam(_ID_PARAM))
+        if self.version_field is not None:
+            stmt = stmt.values({table.c[self.version_field]: table.c[self.version_field] + 1})
+        for rows in rows_by_columns.values():
+            for chunk in batched(rows, self.chunk_size):
+                await self.session.execute(stmt, list(chunk))
+                self._invalidate_cached(row[_ID_PARAM] for row in chunk)
+                # Loaded entities aren't refreshed by the UPDATE, expire their stale values
+                for row in chunk:
+                    loaded = self._get_loaded(row[_ID_PARAM])
+                    if loaded is not None:
+                        expired = [name for name in row if name != _ID_PARAM]
+                        if self.version_field is not None:
+                            expired.append(self.version_field)
+                        self.session.expire(loaded, expired)
+
+    async def upsert(
+        self,
+        dto: DTO,
+        conflict_fields: Collection[str] | None = None,
+        update_fields: Collection[str] | None = None,
+    ) -> DTO:
+        """
+        Create an entity or update the existing one in a single round trip:
+        INSERT ... ON CONFLICT (conflict_fields) DO UPDATE SET update_fields ... RETURNING.
+        :param conflict_fields: Columns of the unique constraint to detect the existing row by, the ID by default
+        :param update_fields: Columns overwritten in the existing row, all but the conflict ones and the primary key
+            by default
+        :raises conflict_exception_class: if the DTO has a version and the existing row has another one
+        :return: The created or updated entity, as stored
+        """
+        entity = self.map_dto_to_model(dto)
+        expected_version = getattr(entity, self.version_field) if self.version_field is not None else None
+        stmt = self._get_upsert_statement(conflict_fields, update_fields, expected_version)
+        resp = await self.session.scalars(
+            stmt.values(**self._get_insert_values_dict(entity)),
+            execution_options={"populate_existing": True},
+        )
+        upserted = resp.one_or_none()
+        if upserted is None:
+            # The existing row didn't pass the version check of DO UPDATE
+            raise self._get_conflict_error(getattr(entity, self.id_field), expected_version)
+        self._invalidate_cached([getattr(upserted, self.id_field)])
+        res: DTO = self.map_model_to_dto(upserted)
+        return res
+
+    async def upsert_many(
+        self,
+        dtos: Iterable[DTO],
+        conflict_fields: Collection[str] | None = None,
+        update_fields: Collection[str] | None = None,
+    ) -> list[DTO]:
+        """
+        Create or update entities in bulk, the same way as `upsert()`: one multi-row
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING per chunk.
+        A row can't be upserted twice by one statement, so of the entities repeated in `dtos`
+        (by the conflict fields) only the last one is written.
+        Versions are incremented but not checked, use `upsert()` to write an entity of a known version.
+        :return: The created or updated entities, as stored, in the input order
+        """
+        conflict_fields = [self.id_field] if conflict_fields is None else list(conflict_fields)
+        stmt = self._get_upsert_statement(conflict_fields, update_fields)
+        entities_by_key: dict[tuple[Any, ...], DBModel] = {}
+        for dto in dtos:
+            entity = self.map_dto_to_model(dto)
+            entities_by_key[tuple(getattr(entity, name) for name in conflict_fields)] = entity
+        entities = list(entities_by_key.values())
+
+        result: list[DTO] = []
+        for chunk in batched(entities, self.chunk_size):
+            resp = await self.session.scalars(
+                stmt,
+                [self._get_insert_values_dict(entity) for entity in chunk],
+                execution_options={"populate_existing": True},
+            )
+            upserted = list(resp)
+            self._invalidate_cached(getattr(entity, self.id_field) for entity in upserted)
+            result.extend(self.map_model_to_dto(entity) for entity in upserted)
+        return result
+
     async def delete(self, entity_id: IDType) -> None:
-        """Delete an entity by ID."""
-        try:
-            entity = await self.session.get_one(self.model, entity_id)
-            await self.session.delete(entity)
-            await self.session.flush()
-        except NoResultFound:
+        """Delete an entity by ID in a single round trip: DELETE ... RETURNING."""
+        id_column = getattr(self.model, self.id_field)
+        resp = await self.session.execute(sa_delete(self.model).where(id_column == entity_id).returning(id_column))
+        if resp.scalar_one_or_none() is None:
             raise self.not_found_exception_class(f"{self.model.__name__} with ID {entity_id} not found for deletion")
+        self._invalidate_cached([entity_id])
+
+    async def delete_many(self, entity_ids: Iterable[IDType], missing_ok: bool = True) -> list[IDType]:
+        """
+        Delete entities by IDs with chunked DELETE ... WHERE id IN (...) RETURNING statements.
+        :param missing_ok: Skip IDs without a row, otherwise raise `not_found_exception_class` for them
+            after deleting the rest, which the caller is expected to roll back
+        :return: IDs of the deleted entities
+        """
+        id_column = getattr(self.model, self.id_field)
+        entity_ids = list(dict.fromkeys(entity_ids))
+        deleted: list[IDType] = []
+        for chunk in batched(entity_ids, self.chunk_size):
+            resp = await self.session.scalars(sa_delete(self.model).where(id_column.in_(chunk)).returning(id_column))
+            deleted.extend(resp)
+        self._invalidate_cached(deleted)
+
+        if not missing_ok and len(deleted) < len(entity_ids):
+            deleted_ids = set(deleted)
+            missing_ids = [entity_id for entity_id in entity_ids if entity_id not in deleted_ids]
+            raise self.not_found_exception_class(
+                f"{self.model.__name__} with IDs {missing_ids} not found for deletion",
+            )
+        return deleted
 
-    def _get_update_values_dict(self, db_model: DBModel) -> dict[str, Any]:
-        """Get a dictionary of values from the DB model."""
+    @staticmethod
+    def _encode_cursor(key: list[Any], fields: list[str], descending: bool) -> str:
+        # The ordering is encoded too, so a cursor can't be applied to another one
+        cursor = pydantic_core.to_json({"fields": fields, "descending": descending, "key": key})
+        return base64.urlsafe_b64encode(cursor).decode()
+
+    def _decode_cursor(self, cursor: str, fields: list[str], descending: bool) -> list[ColumnElement[Any]]:
+        try:
+            data = pydantic_core.from_json(base64.urlsafe_b64decode(cursor))
+            is_same_ordering = data["fields"] == fields and data["descending"] == descending
+            key = [
+                self._cursor_value_to_literal(field, value) for field, value in zip(fields, data["key"], strict=True)
+            ]
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError) as e:
+            raise InvalidCursorError("Malformed cursor") from e
+        if not is_same_ordering:
+            raise InvalidCursorError("Cursor was issued for another ordering")
+        return key
+
+    def _cursor_value_to_literal(self, field: str, value: Any) -> ColumnElement[Any]:
+        column_type = getattr(self.model, field).type
+        # JSON loses types like datetime, restore them from the column type
+        return literal(_get_type_adapter(column_type.python_type).validate_python(value), column_type)
+
+    def _select_for_read(self) -> Select[Any]:
+        """SELECT of entities, or of their plain columns with `bypass_orm`."""
+        return self._columns_select if self.bypass_orm else select(self.model)
+
+    async def _fetch_for_read(self, stmt: Select[Any], params: dict[str, Any] | None = None) -> Sequence[Any]:
+        """Execute a `_select_for_read()` statement, getting entities or rows."""
+        resp = await self.session.execute(stmt, params)
+        entities: Sequence[Any] = resp.all() if self.bypass_orm else resp.scalars().all()
+        return entities
+
+    @staticmethod
+    def _get_spec_shape(
+        spec: Specification | None,
+        filters: dict[str, Any],
+    ) -> tuple[Hashable | None, dict[str, Any]]:
+        """Get the shape of `spec` combined with equality `filters`, and the values of its parameters."""
+        specs: list[Specification] = [Eq(name, value) for name, value in filters.items()]
+        if spec is not None:
+            specs.insert(0, spec)
+        if not specs:
+            return None, {}
+        values: list[Any] = []
+        shape = get_spec_shape(specs[0] if len(specs) == 1 else And(tuple(specs)), values)
+        return shape, {f"p{i}": value for i, value in enumerate(values)}
+
+    def _get_cache_key(self, entity_id: IDType) -> Hashable | None:
+        """Key of the entity in the cache, None if the cache is off or the entity was written in this transaction."""
+        if self.cache is None:
+            return None
+        key = (self.model.__name__, entity_id)
+        pending = self.session.info.get(_PENDING_INVALIDATIONS)
+        if pending and key in pending.get(self.cache, ()):
+            return None
+        return key
+
+    def _get_cached(self, entity_id: IDType) -> Any | None:
+        key = self._get_cache_key(entity_id)
+        return self.cache.get(key) if self.cache is not None and key is not None else None
+
+    def _set_cached(self, entity_id: IDType, dto: DTO) -> None:
+        key = self._get_cache_key(entity_id)
+        if self.cache is not None and key is not None:
+            self.cache.set(key, dto)
+
+    def _invalidate_cached(self, entity_ids: Iterable[IDType]) -> None:
+        """Drop written entities from the cache once the transaction ends, bypassing it for them until then."""
+        if self.cache is None:
+            return
+        sync_session = self.session.sync_session
+        if not event.contains(sync_session, "after_commit", _invalidate_pending):
+            event.listen(sync_session, "after_commit", _invalidate_pending)
+            event.listen(sync_session, "after_rollback", _invalidate_pending)
+        pending = self.session.info.setdefault(_PENDING_INVALIDATIONS, {})
+        pending.setdefault(self.cache, set()).update((self.model.__name__, entity_id) for entity_id in entity_ids)
+
+    def _get_upsert_statement(
+        self,
+        conflict_fields: Collection[str] | None,
+        update_fields: Collection[str] | None,
+        expected_version: Any = None,
+    ) -> Any:
+        conflict_fields = [self.id_field] if conflict_fields is None else list(conflict_fields)
+        columns = self.model.__table__.columns
+        if update_fields is None:
+            update_fields = [
+                column.name
+                for column in columns
+                if not column.primary_key and column.name not in conflict_fields and column.name != self.version_field
+            ]
+        self._check_fields(conflict_fields)
+        self._check_fields(update_fields)
+        if not update_fields:
+            raise ValueError(f"No {self.model.__name__} fields to update on conflict")
+
+        stmt = pg_insert(self.model)
+        set_: dict[str, Any] = {name: stmt.excluded[name] for name in update_fields}
+        where = None
+        if self.version_field is not None:
+            version_column = getattr(self.model, self.version_field)
+            set_[self.version_field] = version_column + 1
+            if expected_version is not None:
+                where = version_column == expected_version
+        return stmt.on_conflict_do_update(index_elements=conflict_fields, set_=set_, where=where).returning(
+            self.model,
+            sort_by_parameter_order=True,
+        )
+
+    def _get_conflict_error(self, entity_id: IDType, expected_version: Any) -> Exception:
+        return self.conflict_exception_class(
+            f"{self.model.__name__} with ID {entity_id} was changed since version {expected_version}",
+        )
+
+    def _check_fields(self, fields: Collection[str]) -> None:
+        if unknown_fields := set(fields).difference(self.model.__table__.columns.keys()):
+            raise ValueError(f"{self.model.__name__} has no fields {sorted(unknown_fields)}")
+
+    def _get_loaded(self, entity_id: IDType) -> DBModel | None:
+        """Get an entity from the session identity map if it's loaded there and usable without a query."""
+        key = sa_inspect(self.model).identity_key_from_primary_key((entity_id,))
+        entity = self.session.identity_map.get(key)
+        if not isinstance(entity, self.model):
+            return None
+        state = sa_inspect(entity)
+        if state.expired_attributes or state.was_deleted:
+            return None
+        return entity
+
+    def _get_insert_values_dict(self, db_model: DBModel) -> dict[str, Any]:
+        """
+        Get a dictionary of values from the DB model, leaving unset columns to their defaults.
+        The version of a versioned entity always starts from the default.
+        """
         values = {column.name: getattr(db_model, column.name) for column in db_model.__table__.columns}
-        del values[self.id_field]
-        del values["creation_date"]
+        return {name: value for name, value in values.items() if value is not None and name != self.version_field}
+
+    def _get_update_values_dict(
+        self,
+        db_model: DBModel,
+        fields: Collection[str] | None = None,
+        skip_unchanged: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Get a dictionary of values to write from the DB model: `fields` or all the columns but the primary key,
+        with `skip_unchanged` without the ones the entity loaded in the session already has.
+        """
+        columns = db_model.__table__.columns
+        if fields is None:
+            fields = [column.name for column in columns if not column.primary_key and column.name != self.version_field]
+        else:
+            self._check_fields(fields)
+            if self.version_field in fields:
+                raise ValueError(f"{self.model.__name__} {self.version_field} is managed by the repository")
 
+        values = {name: getattr(db_model, name) for name in fields}
+        loaded = self._get_loaded(getattr(db_model, self.id_field)) if skip_unchanged else None
+        if loaded is not None:
+            values = {name: value for name, value in values.items() if getattr(loaded, name) != value}
         return values
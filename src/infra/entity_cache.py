@@ -0,0 +1,46 @@
+import time
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any, Protocol
+
+from src.domain.cache import CacheStats, LRUCache
+
+
+class IEntityCache(Protocol):
+    """
+    Backend of the `BaseRepository` read-through cache of DTOs by entity key.
+    Cached DTOs are shared between readers and must not be mutated.
+    """
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get the cached DTO, or None on a miss."""
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    @property
+    def stats(self) -> CacheStats:
+        raise NotImplementedError
+
+
+class LRUEntityCache(LRUCache[Hashable, Any]):
+    """
+    In-process `IEntityCache`, an LRU cache with a TTL bounded by the number of entities.
+
+    Writes through repositories using the cache invalidate it in this process only,
+    so writes made by other processes are seen here after up to `ttl_seconds`.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        :param max_entries: Maximum number of cached entities
+        :param ttl_seconds: Lifetime of an entry, bounds staleness with respect to other processes
+        :param clock: Returns the current time in seconds
+        """
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock)
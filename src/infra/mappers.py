@@ -0,0 +1,57 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar, get_args
+
+from pydantic import BaseModel, SecretStr
+from sqlalchemy import inspect as sa_inspect
+
+from src.infra.db import DBBaseModel
+
+
+DBModel = TypeVar("DBModel", bound=DBBaseModel)
+DTO = TypeVar("DTO", bound=BaseModel)
+
+
+@dataclass(frozen=True, slots=True)
+class Mapper(Generic[DBModel, DTO]):
+    """Functions mapping a model to DTO and back, built by `build_mapper()`."""
+
+    dto_class: type[DTO]
+    # Accepts model instances as well as Core rows of the model columns
+    to_dto: Callable[[Any], DTO]
+    to_model: Callable[[DTO], DBModel]
+
+
+def build_mapper(model_class: type[DBModel], dto_class: type[DTO]) -> Mapper[DBModel, DTO]:
+    """
+    Build functions mapping `model_class` instances (or rows of its columns) to `dto_class` and back,
+    matching DTO fields with the model columns by name.
+
+    DTOs are validated from the model attributes, which wraps `SecretStr` fields,
+    and `SecretStr` fields are unwrapped when mapping to model.
+    :param model_class: SQLAlchemy model class
+    :param dto_class: Pydantic DTO class, all of its fields must be columns of the model
+    :raises ValueError: if a DTO field is not a column of the model
+    """
+    columns = set(sa_inspect(model_class).columns.keys())
+    fields = dto_class.model_fields
+    if unmapped := [name for name in fields if name not in columns]:
+        raise ValueError(f"{dto_class.__name__} fields {unmapped} are not columns of {model_class.__name__}")
+
+    secret_fields = {name for name, info in fields.items() if _is_secret(info.annotation)}
+
+    def to_dto(source: Any) -> DTO:
+        return dto_class.model_validate(source, from_attributes=True)
+
+    def to_model(dto: DTO) -> DBModel:
+        values = {name: getattr(dto, name) for name in fields}
+        for name in secret_fields:
+            if values[name] is not None:
+                values[name] = values[name].get_secret_value()
+        return model_class(**values)
+
+    return Mapper(dto_class=dto_class, to_dto=to_dto, to_model=to_model)
+
+
+def _is_secret(annotation: Any) -> bool:
+    return annotation is SecretStr or SecretStr in get_args(annotation)
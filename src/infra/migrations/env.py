@@ -16,7 +16,7 @@ from src.settings import settings  # noqa: E402
 
 # Import all models to ensure they are registered with Base.metadata
 from src.infra.db import DBBaseModel  # noqa: E402
-from src.infra.user.models import UserModel  # noqa: E402
+from src.infra.user.models import RefreshTokenModel, RevokedTokenModel, UserModel  # noqa: E402
 
 
 # this is the Alembic Config object, which provides
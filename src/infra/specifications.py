@@ -0,0 +1,70 @@
+from collections.abc import Hashable, Iterator
+from itertools import count
+from typing import Any
+
+from sqlalchemy import BindParameter, ColumnElement, and_, bindparam, not_, or_
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.domain.specifications import And, Eq, Ge, Gt, In, Le, Lt, Not, Or, Specification
+from src.infra.db import DBBaseModel
+
+
+def get_spec_shape(spec: Specification, params: list[Any]) -> Hashable:
+    """
+    Get the structure of the specification without its values, appending the values to `params`.
+    Specifications of the same shape compile to the same statement, with the values as bound parameters.
+    """
+    match spec:
+        case Eq(value=None):
+            return ("is_null", spec.field)
+        case Eq() | Lt() | Le() | Gt() | Ge():
+            params.append(spec.value)
+            return (type(spec).__name__, spec.field)
+        case In():
+            # An expanding parameter, so the statement doesn't depend on the number of values
+            params.append(list(spec.values))
+            return ("In", spec.field)
+        case And() | Or():
+            return (type(spec).__name__, tuple(get_spec_shape(item, params) for item in spec.specs))
+        case Not():
+            return ("Not", get_spec_shape(spec.spec, params))
+    raise TypeError(f"Unsupported specification {spec!r}")
+
+
+def build_where_clause(model_class: type[DBBaseModel], shape: Hashable) -> ColumnElement[bool]:
+    """
+    Build the WHERE clause of a `get_spec_shape()` shape, with bound parameters `p0`, `p1`, ...
+    for the values in the order they were collected.
+    """
+    return _build_clause(model_class, shape, count())
+
+
+def _build_clause(model_class: type[DBBaseModel], shape: Any, param_numbers: Iterator[int]) -> ColumnElement[bool]:
+    kind, arg = shape
+    if kind in ("And", "Or"):
+        clauses = [_build_clause(model_class, item, param_numbers) for item in arg]
+        return and_(*clauses) if kind == "And" else or_(*clauses)
+    if kind == "Not":
+        return not_(_build_clause(model_class, arg, param_numbers))
+
+    if arg not in sa_inspect(model_class).columns:
+        raise ValueError(f"{model_class.__name__} has no field {arg}")
+    column: InstrumentedAttribute[Any] = getattr(model_class, arg)
+    if kind == "is_null":
+        return column.is_(None)
+    param: BindParameter[Any] = bindparam(f"p{next(param_numbers)}", expanding=kind == "In")
+    match kind:
+        case "Eq":
+            return column == param
+        case "In":
+            return column.in_(param)
+        case "Lt":
+            return column < param
+        case "Le":
+            return column <= param
+        case "Gt":
+            return column > param
+        case "Ge":
+            return column >= param
+    raise TypeError(f"Unsupported specification shape {shape!r}")
@@ -1,4 +1,6 @@
-from sqlalchemy import String
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.infra.db import DBBaseModel
@@ -9,3 +11,24 @@ class UserModel(DBBaseModel):
 
     username: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(String, nullable=False)
+    # Optimistic concurrency version, incremented by every write through the repository
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+
+class RevokedTokenModel(DBBaseModel):
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class RefreshTokenModel(DBBaseModel):
+    __tablename__ = "refresh_tokens"
+
+    token_hash: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
+    family_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    username: Mapped[str] = mapped_column(String, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
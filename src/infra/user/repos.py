@@ -1,25 +1,233 @@
+from collections.abc import AsyncIterator, Collection, Iterable
+from datetime import datetime
+
+from sqlalchemy import bindparam, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.user import UserAlreadyExistsError, UserDoesNotExistError, UserDTO
-from src.infra.base_repository import BaseRepository
-from src.infra.user.models import UserModel
+from src.domain.specifications import Gt
+from src.domain.user import (
+    InvalidPageCursorError,
+    RefreshTokenDTO,
+    RevokedTokenDTO,
+    UserAlreadyExistsError,
+    UserDoesNotExistError,
+    UserDTO,
+    UserIdentityDTO,
+    UsersPageDTO,
+    UserUpdateConflictError,
+)
+from src.infra.base_repository import BaseRepository, CreateManyResult, InvalidCursorError
+from src.infra.entity_cache import IEntityCache, LRUEntityCache
+from src.infra.mappers import build_mapper
+from src.infra.user.models import RefreshTokenModel, RevokedTokenModel, UserModel
+from src.infra.user.username_filter import KnownUsernamesFilter, known_usernames_filter
+from src.settings import settings
+
+
+# Built once, so every execution hits SQLAlchemy's compiled statement cache with no ORM entity loading
+_PASSWORD_HASH_BY_USERNAME = select(UserModel.password_hash).where(UserModel.username == bindparam("username"))
+
+_user_mapper = build_mapper(UserModel, UserDTO)
+_revoked_token_mapper = build_mapper(RevokedTokenModel, RevokedTokenDTO)
+_refresh_token_mapper = build_mapper(RefreshTokenModel, RefreshTokenDTO)
+
+user_cache = LRUEntityCache(max_entries=settings.USER_CACHE_MAX_ENTRIES, ttl_seconds=settings.USER_CACHE_TTL_SECONDS)
 
 
 class UserRepository(BaseRepository[UserModel, UserDTO, str]):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        username_filter: KnownUsernamesFilter | None = None,
+        bypass_orm: bool = False,
+        cache: IEntityCache | None = None,
+    ):
+        """
+        :param session: SQLAlchemy async session
+        :param username_filter: Filter of existing usernames answering lookups of unknown ones without a query,
+            the shared one is used when USERNAME_FILTER_ENABLED is set
+        :param bypass_orm: Read rows with Core instead of loading ORM entities, for read-only use
+        :param cache: Read-through cache of users, the shared one is used when USER_CACHE_ENABLED is set
+        """
+        if cache is None and settings.USER_CACHE_ENABLED:
+            cache = user_cache
         super().__init__(
             session=session,
             model_class=UserModel,
             id_field="username",
             already_exists_exception_class=UserAlreadyExistsError,
             not_found_exception_class=UserDoesNotExistError,
+            bypass_orm=bypass_orm,
+            cache=cache,
+            version_field="version",
+            conflict_exception_class=UserUpdateConflictError,
         )
+        if username_filter is None and settings.USERNAME_FILTER_ENABLED:
+            username_filter = known_usernames_filter
+        self.username_filter = username_filter
+
+    async def create(self, dto: UserDTO) -> UserDTO:
+        user = await super().create(dto)
+        if self.username_filter is not None:
+            self.username_filter.add(user.username)
+        return user
+
+    async def create_many(self, dtos: Iterable[UserDTO]) -> CreateManyResult[UserDTO, str]:
+        result = await super().create_many(dtos)
+        if self.username_filter is not None:
+            for user in result.created:
+                self.username_filter.add(user.username)
+        return result
+
+    async def upsert(
+        self,
+        dto: UserDTO,
+        conflict_fields: Collection[str] | None = None,
+        update_fields: Collection[str] | None = None,
+    ) -> UserDTO:
+        user = await super().upsert(dto, conflict_fields, update_fields)
+        if self.username_filter is not None:
+            self.username_filter.add(user.username)
+        return user
+
+    async def upsert_many(
+        self,
+        dtos: Iterable[UserDTO],
+        conflict_fields: Collection[str] | None = None,
+        update_fields: Collection[str] | None = None,
+    ) -> list[UserDTO]:
+        users = await super().upsert_many(dtos, conflict_fields, update_fields)
+        if self.username_filter is not None:
+            for user in users:
+                self.username_filter.add(user.username)
+        return users
+
+    async def exists(self, entity_id: str) -> bool:
+        if self.username_filter is not None and not self.username_filter.might_exist(entity_id):
+            return False
+
+        user_exists = await super().exists(entity_id)
+        if not user_exists and self.username_filter is not None:
+            self.username_filter.record_false_positive()
+        return user_exists
 
     async def find_by_username(self, username: str) -> UserDTO | None:
-        return await self.get_by_id(entity_id=username)
+        if self.username_filter is not None and not self.username_filter.might_exist(username):
+            return None
+
+        user = await self.get_by_id(entity_id=username)
+        if user is None and self.username_filter is not None:
+            self.username_filter.record_false_positive()
+        return user
+
+    async def get_password_hash(self, username: str) -> str | None:
+        """
+        Credential lookup for login: selects just the hash column as a plain value,
+        bypassing the identity map and the DTO construction of `find_by_username`.
+        """
+        if self.username_filter is not None and not self.username_filter.might_exist(username):
+            return None
+
+        resp = await self.session.execute(_PASSWORD_HASH_BY_USERNAME, {"username": username})
+        password_hash: str | None = resp.scalar_one_or_none()
+        if password_hash is None and self.username_filter is not None:
+            self.username_filter.record_false_positive()
+        return password_hash
+
+    async def find_existing_usernames(self, usernames: Collection[str]) -> set[str]:
+        if self.username_filter is not None:
+            usernames = [username for username in usernames if self.username_filter.might_exist(username)]
+            if not usernames:
+                return set()
+
+        resp = await self.session.execute(select(UserModel.username).where(UserModel.username.in_(usernames)))
+        return set(resp.scalars())
+
+    async def get_users_page(self, after: str | None, limit: int) -> UsersPageDTO:
+        try:
+            page = await self.get_page(after=after, limit=limit)
+        except InvalidCursorError as e:
+            raise InvalidPageCursorError(str(e)) from e
+        return UsersPageDTO(
+            users=[UserIdentityDTO(username=user.username) for user in page.items],
+            next_cursor=page.next_cursor,
+        )
+
+    async def iter_usernames(self, batch_size: int = 10_000) -> AsyncIterator[str]:
+        """Stream all the usernames with a server-side cursor."""
+        usernames = await self.session.stream_scalars(
+            select(UserModel.username).execution_options(yield_per=batch_size),
+        )
+        try:
+            async for username in usernames:
+                yield username
+        finally:
+            await usernames.close()
 
     def map_dto_to_model(self, dto: UserDTO) -> UserModel:
-        return UserModel(username=dto.username, password_hash=dto.password_hash.get_secret_value())
+        return _user_mapper.to_model(dto)
 
     def map_model_to_dto(self, model: UserModel) -> UserDTO:
-        return UserDTO(username=model.username, password_hash=model.password_hash)
+        return _user_mapper.to_dto(model)
+
+
+class RevokedTokenRepository(BaseRepository[RevokedTokenModel, RevokedTokenDTO, str]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(
+            session=session,
+            model_class=RevokedTokenModel,
+            id_field="jti",
+        )
+
+    async def revoke(self, token: RevokedTokenDTO) -> None:
+        # INSERT ... ON CONFLICT DO NOTHING, so concurrent revocations of the same token don't fail
+        await self.create_many([token])
+
+    async def is_revoked(self, jti: str) -> bool:
+        return await self.exists(jti)
+
+    async def get_active(self, now: datetime) -> list[RevokedTokenDTO]:
+        return await self.find_by(Gt("expires_at", now))
+
+    async def get_revoked_since(self, since: datetime, now: datetime) -> list[RevokedTokenDTO]:
+        return await self.find_by(Gt("revoked_at", since) & Gt("expires_at", now))
+
+    async def delete_expired(self, now: datetime) -> None:
+        await self.session.execute(delete(RevokedTokenModel).where(RevokedTokenModel.expires_at <= now))
+
+    def map_dto_to_model(self, dto: RevokedTokenDTO) -> RevokedTokenModel:
+        return _revoked_token_mapper.to_model(dto)
+
+    def map_model_to_dto(self, model: RevokedTokenModel) -> RevokedTokenDTO:
+        return _revoked_token_mapper.to_dto(model)
+
+
+class RefreshTokenRepository(BaseRepository[RefreshTokenModel, RefreshTokenDTO, str]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(
+            session=session,
+            model_class=RefreshTokenModel,
+            id_field="token_hash",
+        )
+
+    async def mark_used(self, token_hash: str, used_at: datetime) -> bool:
+        resp = await self.session.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.token_hash == token_hash, RefreshTokenModel.used_at.is_(None))
+            .values(used_at=used_at)
+            .returning(RefreshTokenModel.token_hash),
+        )
+        return resp.scalar_one_or_none() is not None
+
+    async def revoke_family(self, family_id: str, revoked_at: datetime) -> None:
+        await self.session.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.family_id == family_id, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=revoked_at),
+        )
+
+    def map_dto_to_model(self, dto: RefreshTokenDTO) -> RefreshTokenModel:
+        return _refresh_token_mapper.to_model(dto)
+
+    def map_model_to_dto(self, model: RefreshTokenModel) -> RefreshTokenDTO:
+        return _refresh_token_mapper.to_dto(model)
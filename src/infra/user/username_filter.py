@@ -0,0 +1,96 @@
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+
+from src.domain.user.bloom import BloomFilter
+from src.settings import settings
+
+
+@dataclass(frozen=True, slots=True)
+class UsernameFilterStats:
+    lookups: int
+    definitely_absent: int
+    false_positives: int
+    usernames: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered without a query."""
+        return self.definitely_absent / self.lookups if self.lookups else 0.0
+
+
+class KnownUsernamesFilter:
+    """
+    Bloom filter of existing usernames, put in front of username lookups.
+
+    A username that is not in the filter definitely doesn't exist, so lookups for it
+    (e.g. credential stuffing with made-up usernames) return without a query.
+    Until the filter is loaded every username is reported as possibly existing.
+
+    The filter is per process: users registered in this process are added right away,
+    users registered by other processes only after the next `reload()`.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        :param capacity: Expected number of usernames, the filter grows past it on reload
+        :param error_rate: Acceptable false positive probability
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom: BloomFilter | None = None
+        self._added_while_loading: list[str] | None = None
+        self._lookups = 0
+        self._definitely_absent = 0
+        self._false_positives = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._bloom is not None
+
+    def might_exist(self, username: str) -> bool:
+        self._lookups += 1
+        if self._bloom is None or username in self._bloom:
+            return True
+        self._definitely_absent += 1
+        return False
+
+    def add(self, username: str) -> None:
+        if self._bloom is not None:
+            self._bloom.add(username)
+        if self._added_while_loading is not None:
+            self._added_while_loading.append(username)
+
+    def record_false_positive(self) -> None:
+        """Record that a possibly existing username turned out to be absent."""
+        self._false_positives += 1
+
+    async def reload(self, usernames: AsyncIterable[str]) -> None:
+        """Rebuild the filter from all the existing usernames."""
+        capacity = max(self.capacity, 2 * len(self._bloom) if self._bloom is not None else 0)
+        bloom = BloomFilter(capacity, self.error_rate)
+        # Usernames registered while the (possibly long) load is in progress may be missing from it
+        added_while_loading: list[str] = []
+        self._added_while_loading = added_while_loading
+        try:
+            async for username in usernames:
+                bloom.add(username)
+            for username in added_while_loading:
+                bloom.add(username)
+            self._bloom = bloom
+        finally:
+            self._added_while_loading = None
+
+    @property
+    def stats(self) -> UsernameFilterStats:
+        return UsernameFilterStats(
+            lookups=self._lookups,
+            definitely_absent=self._definitely_absent,
+            false_positives=self._false_positives,
+            usernames=len(self._bloom) if self._bloom is not None else 0,
+        )
+
+
+known_usernames_filter = KnownUsernamesFilter(
+    capacity=settings.USERNAME_FILTER_CAPACITY,
+    error_rate=settings.USERNAME_FILTER_ERROR_RATE,
+)
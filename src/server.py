@@ -1,10 +1,39 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.app import auth_router
+
+from src.app import auth_router, users_router, well_known_router
+from src.app.tasks import reload_known_usernames, run_periodically, sync_revocation_list
+from src.domain.user.hash_executor import password_hash_executor
+from src.settings import settings
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
+    tasks = [
+        asyncio.create_task(run_periodically(sync_revocation_list, settings.AUTH_REVOCATION_SYNC_INTERVAL_SECONDS)),
+    ]
+    if settings.USERNAME_FILTER_ENABLED:
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(reload_known_usernames, settings.USERNAME_FILTER_RELOAD_INTERVAL_SECONDS),
+            ),
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    password_hash_executor.shutdown()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(auth_router)
+app.include_router(users_router)
+app.include_router(well_known_router)
 
 
 app.add_middleware(
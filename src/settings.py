@@ -1,4 +1,4 @@
-from typing import Any, cast
+from typing import Any, Literal, cast
 
 from pydantic import PostgresDsn, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -34,10 +34,73 @@ class Settings(BaseSettings):
 
     # Auth
     AUTH_SECRET_KEY: SecretStr
-    AUTH_PASSWORD_SALT: SecretStr
-    AUTH_HASH_ALGORITHM: str = "HS256"
-    AUTH_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
+    AUTH_PASSWORD_SALT: SecretStr  # Only used to verify legacy SHA-256 hashes until they are rehashed
+    AUTH_HASH_ALGORITHM: str = "HS256"  # HS* signs with AUTH_SECRET_KEY, EdDSA / RS256 with AUTH_SIGNING_KEYS
+    AUTH_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # Short-lived, renewed with refresh tokens
+    AUTH_REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     AUTH_ACCESS_TOKEN_USERNAME_FIELD: str = "sub"
+    # Sign the user identity into access tokens and resolve the current user from them without a DB lookup.
+    # A deleted user stays authenticated until their token expires.
+    AUTH_STATELESS_TOKENS: bool = False
+    AUTH_ACCESS_TOKEN_USER_FIELD: str = "usr"
+
+    # Asymmetric signing keys and their rotation.
+    # Private keys (PEM) by key ID, all of them are published in JWKS, the active one signs new tokens.
+    # To rotate: add the new key, wait for AUTH_JWKS_MAX_AGE_SECONDS so verifiers fetch it, make it active,
+    # then move the old key's public part to AUTH_VERIFICATION_KEYS until the tokens it signed expire.
+    AUTH_SIGNING_KEYS: dict[str, SecretStr] = {}
+    AUTH_ACTIVE_SIGNING_KEY_ID: str | None = None
+    # Public keys (PEM) of retired signing keys by key ID, only used for verification
+    AUTH_VERIFICATION_KEYS: dict[str, str] = {}
+    AUTH_JWKS_MAX_AGE_SECONDS: int = 60 * 60  # 1 hour
+
+    # Verified token claims cache
+    AUTH_TOKEN_CACHE_ENABLED: bool = True
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+    AUTH_TOKEN_CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # 16 MiB
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 5 * 60  # 5 minutes
+
+    AUTH_INTROSPECT_MAX_TOKENS: int = 1000
+    # Secrets of the clients (resource servers) allowed to introspect tokens by client ID, sent with HTTP Basic.
+    # Introspection is closed to everyone until a client is configured.
+    AUTH_INTROSPECTION_CLIENTS: dict[str, SecretStr] = {}
+
+    # Users listing, only for admins: registration is open, so any user could otherwise enumerate usernames
+    AUTH_ADMIN_USERNAMES: set[str] = set()
+    USERS_PAGE_DEFAULT_LIMIT: int = 50
+    USERS_PAGE_MAX_LIMIT: int = 500
+
+    # Revoked tokens
+    AUTH_REVOCATION_SYNC_INTERVAL_SECONDS: int = 30
+    AUTH_REVOCATION_BLOOM_CAPACITY: int = 100_000
+    AUTH_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    # Expired tokens stay in the filter until the next rebuild, done at most this often
+    AUTH_REVOCATION_REBUILD_INTERVAL_SECONDS: int = 60 * 60  # 1 hour
+
+    # Bloom filter of existing usernames answering lookups of unknown ones without a query.
+    # Per process: users registered by other processes are seen after the next reload.
+    USERNAME_FILTER_ENABLED: bool = False
+    USERNAME_FILTER_CAPACITY: int = 1_000_000
+    USERNAME_FILTER_ERROR_RATE: float = 0.01
+    USERNAME_FILTER_RELOAD_INTERVAL_SECONDS: int = 60
+
+    # In-process read-through cache of users by username, writes in other processes are seen after the TTL
+    USER_CACHE_ENABLED: bool = False
+    USER_CACHE_MAX_ENTRIES: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 30
+
+    # Password hashing executor
+    AUTH_PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "process"
+    AUTH_PASSWORD_HASH_MAX_WORKERS: int | None = None  # None means the executor default
+    AUTH_PASSWORD_HASH_MAX_CONCURRENCY: int = 8
+    AUTH_PASSWORD_HASH_MAX_QUEUE_SIZE: int = 256
+
+    # Password hashers. Changing the hasher or its cost rehashes passwords on the next login
+    AUTH_PASSWORD_HASHER: Literal["scrypt", "pbkdf2_sha256"] = "scrypt"
+    AUTH_SCRYPT_N: int = 2**14
+    AUTH_SCRYPT_R: int = 8
+    AUTH_SCRYPT_P: int = 1
+    AUTH_PBKDF2_ITERATIONS: int = 600_000
 
     model_config = SettingsConfigDict(
         env_file=".env",
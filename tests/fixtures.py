@@ -1,14 +1,43 @@
+from typing import Generic, TypeVar
+
 import pytest
 
 from src.domain.user import User
-from src.infra.user.repos import UserRepository
+from src.infra.user.repos import RefreshTokenRepository, RevokedTokenRepository, UserRepository
+
+
+T = TypeVar("T")
+
+
+class FakeClock(Generic[T]):
+    """Clock for components taking a `clock` callable, returning `now` until a test moves it."""
+
+    def __init__(self, now: T):
+        self.now = now
+
+    def __call__(self) -> T:
+        return self.now
 
 
 @pytest.fixture
-def user_aggregate(user_repository):
-    return User(repo=user_repository)
+def user_aggregate(user_repository, revoked_token_repository, refresh_token_repository):
+    return User(
+        repo=user_repository,
+        revoked_tokens_repo=revoked_token_repository,
+        refresh_tokens_repo=refresh_token_repository,
+    )
 
 
 @pytest.fixture
 def user_repository(test_db_session):
-    return UserRepository(test_db_session)
\ No newline at end of file
+    return UserRepository(test_db_session)
+
+
+@pytest.fixture
+def revoked_token_repository(test_db_session):
+    return RevokedTokenRepository(test_db_session)
+
+
+@pytest.fixture
+def refresh_token_repository(test_db_session):
+    return RefreshTokenRepository(test_db_session)
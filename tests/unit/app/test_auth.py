@@ -0,0 +1,25 @@
+import pytest
+from pydantic import SecretStr
+
+from src.settings import settings
+
+
+@pytest.mark.anyio
+async def test_introspect_requires_client_authentication(test_client, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_INTROSPECTION_CLIENTS", {"gateway": SecretStr("secret")})
+
+    anonymous = await test_client.post("/auth/introspect", json={"tokens": ["token"]})
+    wrong_secret = await test_client.post("/auth/introspect", json={"tokens": ["token"]}, auth=("gateway", "nope"))
+
+    assert anonymous.status_code == 401
+    assert wrong_secret.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_introspect_for_authenticated_client(test_client, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_INTROSPECTION_CLIENTS", {"gateway": SecretStr("secret")})
+
+    response = await test_client.post("/auth/introspect", json={"tokens": ["token"]}, auth=("gateway", "secret"))
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [{"active": False, "username": None, "exp": None}]
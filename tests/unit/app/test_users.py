@@ -0,0 +1,40 @@
+import pytest
+
+from src.app.dependencies.auth import current_user_di
+from src.domain.user import UserDTO, UserIdentityDTO
+from src.settings import settings
+
+
+@pytest.mark.anyio
+async def test_list_users_forbidden_for_regular_user(app, test_client, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_ADMIN_USERNAMES", {"admin"})
+    app.dependency_overrides[current_user_di] = lambda: UserIdentityDTO(username="regular")
+
+    response = await test_client.get("/users")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.anyio
+async def test_list_users_pages_for_admin(app, test_client, user_repository, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_ADMIN_USERNAMES", {"admin"})
+    app.dependency_overrides[current_user_di] = lambda: UserIdentityDTO(username="admin")
+    await user_repository.create_many([UserDTO(username=f"listed_{i}", password_hash="hash") for i in range(3)])
+
+    usernames: list[str] = []
+    pages = 0
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = await test_client.get("/users", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["users"]) <= 2
+        usernames.extend(user["username"] for user in page["users"])
+        pages += 1
+        if page["next_cursor"] is None:
+            break
+        params["after"] = page["next_cursor"]
+
+    assert pages >= 2
+    assert usernames == sorted(set(usernames))
+    assert {"listed_0", "listed_1", "listed_2"} <= set(usernames)
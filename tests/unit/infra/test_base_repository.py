@@ -0,0 +1,304 @@
+from contextlib import aclosing
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from src.domain.specifications import In
+from src.domain.user import RefreshTokenDTO, UserDoesNotExistError, UserDTO, UserUpdateConflictError
+from src.infra.base_repository import InvalidCursorError
+from src.infra.user.models import UserModel
+from src.infra.user.repos import UserRepository
+
+
+@pytest.mark.anyio
+async def test_create_many_reports_conflicts(user_repository):
+    await user_repository.create(UserDTO(username="taken", password_hash="hash"))
+    user_repository.chunk_size = 2
+
+    result = await user_repository.create_many(
+        [
+            UserDTO(username="new_1", password_hash="hash"),
+            UserDTO(username="taken", password_hash="hash"),
+            UserDTO(username="new_2", password_hash="hash"),
+            UserDTO(username="new_1", password_hash="hash"),
+        ],
+    )
+
+    assert [user.username for user in result.created] == ["new_1", "new_2"]
+    assert result.conflicted_ids == ["taken", "new_1"]
+    assert await user_repository.find_by_username("new_2") is not None
+
+
+@pytest.mark.anyio
+async def test_create_many_duplicates_within_chunk(user_repository):
+    result = await user_repository.create_many(
+        [
+            UserDTO(username="dup", password_hash="first"),
+            UserDTO(username="other", password_hash="hash"),
+            UserDTO(username="dup", password_hash="second"),
+        ],
+    )
+
+    assert [user.username for user in result.created] == ["dup", "other"]
+    assert result.created[0].password_hash.get_secret_value() == "first"
+    assert result.conflicted_ids == ["dup"]
+    user = await user_repository.find_by_username("dup")
+    assert user.password_hash.get_secret_value() == "first"
+
+
+@pytest.mark.anyio
+async def test_create_many_empty(user_repository):
+    result = await user_repository.create_many([])
+
+    assert result.created == []
+    assert result.conflicted_ids == []
+
+
+@pytest.mark.anyio
+async def test_get_many_preserves_order_and_reports_misses(user_repository):
+    await user_repository.create_many([UserDTO(username=name, password_hash="hash") for name in ("u1", "u2", "u3")])
+    user_repository.chunk_size = 2
+
+    users = await user_repository.get_many(["u3", "missing", "u1", "u3", "u2"])
+
+    assert [user.username if user else None for user in users] == ["u3", None, "u1", "u3", "u2"]
+
+
+@pytest.mark.anyio
+async def test_stream_all(user_repository):
+    await user_repository.create_many([UserDTO(username=name, password_hash="hash") for name in ("s1", "s2", "s3")])
+
+    usernames = [user.username async for user in user_repository.stream_all(yield_per=2)]
+
+    assert sorted(usernames) == ["s1", "s2", "s3"]
+
+
+@pytest.mark.anyio
+async def test_stream_all_closes_cursor_when_stopped_early(user_repository, monkeypatch):
+    await user_repository.create_many([UserDTO(username=name, password_hash="hash") for name in ("s1", "s2", "s3")])
+    results = []
+    stream_scalars = user_repository.session.stream_scalars
+
+    async def spy_stream_scalars(*args, **kwargs):
+        result = await stream_scalars(*args, **kwargs)
+        results.append(result)
+        return result
+
+    monkeypatch.setattr(user_repository.session, "stream_scalars", spy_stream_scalars)
+
+    async with aclosing(user_repository.stream_all(yield_per=1)) as users:
+        async for _ in users:
+            break
+
+    assert results[0].closed
+
+
+@pytest.mark.anyio
+async def test_get_page_follows_cursor(user_repository):
+    await user_repository.create_many([UserDTO(username=f"p{i}", password_hash="hash") for i in range(5)])
+
+    first = await user_repository.get_page(limit=3)
+    second = await user_repository.get_page(after=first.next_cursor, limit=3)
+
+    assert [user.username for user in first.items] == ["p0", "p1", "p2"]
+    assert [user.username for user in second.items] == ["p3", "p4"]
+    assert second.next_cursor is None
+
+
+@pytest.mark.anyio
+async def test_get_page_rejects_cursor_of_another_ordering(user_repository):
+    await user_repository.create_many([UserDTO(username=f"p{i}", password_hash="hash") for i in range(3)])
+    page = await user_repository.get_page(limit=1)
+
+    with pytest.raises(InvalidCursorError):
+        await user_repository.get_page(after=page.next_cursor, descending=True)
+
+
+@pytest.mark.anyio
+async def test_update_writes_only_given_fields(refresh_token_repository):
+    token = RefreshTokenDTO(token_hash="t", family_id="f", username="u", expires_at=datetime(2030, 1, 1, tzinfo=UTC))
+    await refresh_token_repository.create(token)
+    used_at = datetime(2029, 1, 1, tzinfo=UTC)
+
+    await refresh_token_repository.update(token.model_copy(update={"used_at": used_at, "family_id": "g"}), ["used_at"])
+
+    stored = await refresh_token_repository.get_by_id("t")
+    assert stored.used_at == used_at
+    assert stored.family_id == "f"
+
+
+@pytest.mark.anyio
+async def test_update_writes_given_fields_even_if_loaded_entity_has_them(user_repository, test_db_session):
+    await user_repository.create(UserDTO(username="stale", password_hash="old"))
+    users = UserModel.__table__
+    # Committed by another transaction: the entity loaded in the session still has the old hash
+    await test_db_session.execute(update(users).where(users.c.username == "stale").values(password_hash="concurrent"))
+
+    await user_repository.update(UserDTO(username="stale", password_hash="old"), ["password_hash"])
+
+    stored = await test_db_session.scalar(select(users.c.password_hash).where(users.c.username == "stale"))
+    assert stored == "old"
+
+
+@pytest.mark.anyio
+async def test_update_without_fields_to_write(refresh_token_repository):
+    token = RefreshTokenDTO(token_hash="t", family_id="f", username="u", expires_at=datetime(2030, 1, 1, tzinfo=UTC))
+
+    assert await refresh_token_repository.update(token, []) == token
+
+
+@pytest.mark.anyio
+async def test_update_many(user_repository):
+    await user_repository.create_many([UserDTO(username=f"m{i}", password_hash="old") for i in range(3)])
+
+    await user_repository.update_many(
+        [UserDTO(username="m0", password_hash="new"), UserDTO(username="m2", password_hash="new")],
+    )
+
+    users = await user_repository.get_many(["m0", "m1", "m2"])
+    assert [user.password_hash.get_secret_value() for user in users] == ["new", "old", "new"]
+
+
+@pytest.mark.anyio
+async def test_update_many_skips_missing_entity(user_repository):
+    # A single row is a batch of its own, the case the ORM bulk UPDATE checked the row count of
+    await user_repository.update_many([UserDTO(username="missing", password_hash="new")])
+
+    assert await user_repository.find_by_username("missing") is None
+
+
+@pytest.mark.anyio
+async def test_upsert_creates_or_updates(user_repository):
+    created = await user_repository.upsert(UserDTO(username="upserted", password_hash="old"))
+    updated = await user_repository.upsert(UserDTO(username="upserted", password_hash="new"))
+
+    assert created.password_hash.get_secret_value() == "old"
+    assert updated.password_hash.get_secret_value() == "new"
+    user = await user_repository.find_by_username("upserted")
+    assert user.password_hash.get_secret_value() == "new"
+
+
+@pytest.mark.anyio
+async def test_upsert_many_keeps_input_order_and_last_duplicate(user_repository):
+    await user_repository.create(UserDTO(username="u1", password_hash="old"))
+
+    users = await user_repository.upsert_many(
+        [
+            UserDTO(username="u2", password_hash="first"),
+            UserDTO(username="u1", password_hash="new"),
+            UserDTO(username="u2", password_hash="last"),
+        ],
+    )
+
+    assert [(user.username, user.password_hash.get_secret_value()) for user in users] == [
+        ("u2", "last"),
+        ("u1", "new"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_update_of_stale_version_conflicts(user_repository):
+    user = await user_repository.create(UserDTO(username="versioned", password_hash="old"))
+
+    updated = await user_repository.update(UserDTO(username="versioned", password_hash="new", version=user.version))
+
+    assert updated.version == user.version + 1
+    with pytest.raises(UserUpdateConflictError):
+        await user_repository.update(UserDTO(username="versioned", password_hash="stale", version=user.version))
+
+
+@pytest.mark.anyio
+async def test_update_of_stale_version_conflicts_with_stale_loaded_entity(user_repository, test_db_session):
+    user = await user_repository.create(UserDTO(username="versioned", password_hash="old"))
+    # Committed by another transaction: the entity loaded in the session still has the old version
+    await test_db_session.execute(
+        update(UserModel.__table__)
+        .where(UserModel.__table__.c.username == "versioned")
+        .values(password_hash="concurrent", version=user.version + 1),
+    )
+
+    with pytest.raises(UserUpdateConflictError):
+        await user_repository.update(UserDTO(username="versioned", password_hash="old", version=user.version))
+
+
+@pytest.mark.anyio
+async def test_upsert_of_stale_version_conflicts(user_repository):
+    user = await user_repository.upsert(UserDTO(username="versioned", password_hash="old"))
+    await user_repository.upsert(UserDTO(username="versioned", password_hash="new"))
+
+    with pytest.raises(UserUpdateConflictError):
+        await user_repository.upsert(UserDTO(username="versioned", password_hash="stale", version=user.version))
+
+
+@pytest.mark.anyio
+async def test_delete_missing_raises(user_repository):
+    await user_repository.create(UserDTO(username="d", password_hash="hash"))
+
+    await user_repository.delete("d")
+
+    assert await user_repository.get_by_id("d") is None
+    with pytest.raises(UserDoesNotExistError):
+        await user_repository.delete("d")
+
+
+@pytest.mark.anyio
+async def test_delete_many(user_repository):
+    await user_repository.create_many([UserDTO(username=f"d{i}", password_hash="hash") for i in range(3)])
+    user_repository.chunk_size = 2
+
+    deleted = await user_repository.delete_many(["d0", "missing", "d2", "d0"])
+
+    assert sorted(deleted) == ["d0", "d2"]
+    assert [user.username if user else None for user in await user_repository.get_many(["d0", "d1", "d2"])] == [
+        None,
+        "d1",
+        None,
+    ]
+    with pytest.raises(UserDoesNotExistError):
+        await user_repository.delete_many(["d1", "missing"], missing_ok=False)
+
+
+@pytest.mark.anyio
+async def test_exists_and_count(refresh_token_repository):
+    expires_at = datetime(2030, 1, 1, tzinfo=UTC)
+    await refresh_token_repository.create_many(
+        [
+            RefreshTokenDTO(token_hash="c1", family_id="f", username="u", expires_at=expires_at),
+            RefreshTokenDTO(token_hash="c2", family_id="f", username="u", expires_at=expires_at),
+            RefreshTokenDTO(token_hash="c3", family_id="g", username="u", expires_at=expires_at),
+        ],
+    )
+
+    assert await refresh_token_repository.exists("c1")
+    assert not await refresh_token_repository.exists("missing")
+    assert await refresh_token_repository.count(family_id="f") == 2
+    assert await refresh_token_repository.count(family_id="f", username="other") == 0
+
+
+@pytest.mark.anyio
+async def test_find_by(user_repository):
+    await user_repository.create_many(
+        [UserDTO(username=f"f{i}", password_hash="even" if i % 2 == 0 else "odd") for i in range(5)],
+    )
+
+    users = await user_repository.find_by(
+        In("username", ["f0", "f1", "f2", "f4"]),
+        password_hash="even",
+        order_by="username",
+        descending=True,
+        limit=2,
+    )
+
+    assert [user.username for user in users] == ["f4", "f2"]
+
+
+@pytest.mark.anyio
+async def test_bypass_orm_reads(test_db_session, user_repository):
+    await user_repository.create_many([UserDTO(username=f"b{i}", password_hash="hash") for i in range(3)])
+    repository = UserRepository(test_db_session, bypass_orm=True)
+
+    assert await repository.get_by_id("b1") == await user_repository.get_by_id("b1")
+    assert [user.username if user else None for user in await repository.get_many(["b2", "missing"])] == ["b2", None]
+    streamed = [user.username async for user in repository.stream_all()]
+    assert sorted(streamed) == sorted(user.username for user in await repository.get_all())
@@ -0,0 +1,19 @@
+import pytest
+
+from src.domain.user import UserDTO
+from src.infra.entity_cache import LRUEntityCache
+from src.infra.user.repos import UserRepository
+
+
+@pytest.mark.anyio
+async def test_repository_reads_own_writes_past_the_cache(test_db_session):
+    cache = LRUEntityCache(max_entries=10, ttl_seconds=60)
+    repository = UserRepository(test_db_session, cache=cache)
+    await repository.create(UserDTO(username="cached", password_hash="old"))
+
+    await repository.update(UserDTO(username="cached", password_hash="new"))
+    user = await repository.find_by_username("cached")
+
+    assert user.password_hash.get_secret_value() == "new"
+    # Entities written in the transaction are cached only after it ends
+    assert cache.stats.entries == 0
@@ -0,0 +1,55 @@
+from datetime import UTC, datetime
+
+import pytest
+from pydantic import BaseModel, SecretStr
+from sqlalchemy import create_engine, insert, select
+
+from src.domain.user import RefreshTokenDTO, UserDTO
+from src.infra.mappers import build_mapper
+from src.infra.user.models import RefreshTokenModel, UserModel
+
+
+def test_to_dto_matches_validated_dto():
+    mapper = build_mapper(UserModel, UserDTO)
+
+    dto = mapper.to_dto(UserModel(username="alice", password_hash="hash"))
+
+    assert dto == UserDTO(username="alice", password_hash="hash")
+    assert isinstance(dto.password_hash, SecretStr)
+
+
+def test_to_model_unwraps_secrets():
+    mapper = build_mapper(UserModel, UserDTO)
+
+    model = mapper.to_model(UserDTO(username="alice", password_hash="hash"))
+
+    assert (model.username, model.password_hash) == ("alice", "hash")
+
+
+def test_optional_fields_round_trip():
+    mapper = build_mapper(RefreshTokenModel, RefreshTokenDTO)
+    dto = RefreshTokenDTO(token_hash="t", family_id="f", username="u", expires_at=datetime(2030, 1, 1, tzinfo=UTC))
+
+    assert mapper.to_dto(mapper.to_model(dto)) == dto
+
+
+def test_to_dto_from_core_row():
+    mapper = build_mapper(UserModel, UserDTO)
+    engine = create_engine("sqlite://")
+    UserModel.metadata.create_all(engine, tables=[UserModel.__table__])
+    with engine.begin() as connection:
+        connection.execute(insert(UserModel), {"username": "alice", "password_hash": "hash", "version": 3})
+        row = connection.execute(select(*UserModel.__table__.columns)).one()
+
+    dto = mapper.to_dto(row)
+
+    assert (dto.username, dto.password_hash.get_secret_value(), dto.version) == ("alice", "hash", 3)
+
+
+def test_dto_fields_must_be_columns():
+    class ProfileDTO(BaseModel):
+        username: str
+        email: str
+
+    with pytest.raises(ValueError, match="email"):
+        build_mapper(UserModel, ProfileDTO)
@@ -0,0 +1,33 @@
+import pytest
+
+from src.domain.specifications import Eq, Gt, In
+from src.infra.specifications import build_where_clause, get_spec_shape
+from src.infra.user.models import RefreshTokenModel
+
+
+def test_specs_of_same_shape_share_it():
+    first_params: list = []
+    second_params: list = []
+
+    first = get_spec_shape(Eq("username", "a") & ~In("family_id", ["x"]), first_params)
+    second = get_spec_shape(Eq("username", "b") & ~In("family_id", ["y", "z"]), second_params)
+
+    assert first == second
+    assert first_params == ["a", ["x"]]
+    assert second_params == ["b", ["y", "z"]]
+
+
+def test_eq_none_is_a_null_check():
+    params: list = []
+
+    shape = get_spec_shape(Eq("used_at", None) | Gt("used_at", 1), params)
+
+    assert params == [1]
+    assert str(build_where_clause(RefreshTokenModel, shape)) == (
+        "refresh_tokens.used_at IS NULL OR refresh_tokens.used_at > :p0"
+    )
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError, match="has no field"):
+        build_where_clause(RefreshTokenModel, get_spec_shape(Eq("unknown", 1), []))
@@ -0,0 +1,52 @@
+from collections.abc import AsyncIterator, Iterable
+
+import pytest
+
+from src.infra.user.username_filter import KnownUsernamesFilter
+
+
+async def _aiter(usernames: Iterable[str]) -> AsyncIterator[str]:
+    for username in usernames:
+        yield username
+
+
+def test_unloaded_filter_lets_every_lookup_through():
+    usernames = KnownUsernamesFilter(capacity=100, error_rate=0.01)
+
+    assert usernames.might_exist("anyone")
+    assert usernames.stats.definitely_absent == 0
+
+
+@pytest.mark.anyio
+async def test_loaded_filter_short_circuits_unknown_usernames():
+    usernames = KnownUsernamesFilter(capacity=100, error_rate=0.001)
+    await usernames.reload(_aiter(["alice", "bob"]))
+
+    assert usernames.might_exist("alice")
+    assert not usernames.might_exist("mallory")
+    assert usernames.stats.lookups == 2
+    assert usernames.stats.hit_rate == 0.5
+
+
+@pytest.mark.anyio
+async def test_registered_username_is_added():
+    usernames = KnownUsernamesFilter(capacity=100, error_rate=0.001)
+    await usernames.reload(_aiter(["alice"]))
+
+    usernames.add("carol")
+
+    assert usernames.might_exist("carol")
+
+
+@pytest.mark.anyio
+async def test_username_registered_during_reload_is_kept():
+    usernames = KnownUsernamesFilter(capacity=100, error_rate=0.001)
+    await usernames.reload(_aiter(["alice"]))
+
+    async def load_with_registration() -> AsyncIterator[str]:
+        yield "alice"
+        usernames.add("dave")
+
+    await usernames.reload(load_with_registration())
+
+    assert usernames.might_exist("dave")
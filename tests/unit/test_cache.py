@@ -0,0 +1,39 @@
+from src.domain.cache import LRUCache
+from tests.fixtures import FakeClock
+
+
+def test_cache_hit_and_miss_counters():
+    cache = LRUCache(max_entries=10, ttl_seconds=60)
+
+    assert cache.get("key") is None
+    cache.set("key", "value")
+
+    assert cache.get("key") == "value"
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_cache_entry_expires_after_ttl():
+    clock = FakeClock(1_000.0)
+    cache = LRUCache(max_entries=10, ttl_seconds=60, clock=clock)
+    cache.set("key", "value")
+
+    clock.now += 61
+
+    assert cache.get("key") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats.entries == 0
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.domain.user.errors import PasswordHashingOverloadedError
+from src.domain.user.hash_executor import PasswordHashExecutor
+
+
+@pytest.fixture
+def hash_executor():
+    executor = PasswordHashExecutor(kind="thread", max_workers=2, max_concurrency=1, max_queue_size=1)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.anyio
+async def test_run_returns_function_result(hash_executor: PasswordHashExecutor):
+    result = await hash_executor.run(pow, 2, 10)
+
+    assert result == 1024
+    assert hash_executor.stats.completed == 1
+    assert hash_executor.stats.running == 0
+
+
+@pytest.mark.anyio
+async def test_run_fails_fast_when_queue_is_full(hash_executor: PasswordHashExecutor):
+    release = threading.Event()
+    running = asyncio.create_task(hash_executor.run(release.wait))
+    await asyncio.sleep(0.01)
+    queued = asyncio.create_task(hash_executor.run(pow, 2, 2))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(PasswordHashingOverloadedError):
+        await hash_executor.run(pow, 2, 3)
+    assert hash_executor.stats.queued == 1
+    assert hash_executor.stats.rejected == 1
+
+    release.set()
+    assert await running is True
+    assert await queued == 4
+    assert hash_executor.stats.peak_queued == 1
+    assert hash_executor.stats.max_wait_seconds > 0
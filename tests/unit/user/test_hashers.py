@@ -0,0 +1,78 @@
+import pickle
+
+from src.domain.user.hashers import (
+    LegacySHA256PasswordHasher,
+    PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+def test_scrypt_hash_is_self_describing_and_salted():
+    hasher = ScryptPasswordHasher(n=1024, r=8, p=1)
+
+    first = hasher.hash("secret")
+    second = hasher.hash("secret")
+
+    assert first.startswith("scrypt$n=1024,r=8,p=1$")
+    assert first != second
+    assert hasher.verify("secret", first)
+    assert not hasher.verify("wrong", first)
+
+
+def test_pbkdf2_hash_verifies():
+    hasher = PBKDF2PasswordHasher(iterations=1000)
+
+    encoded = hasher.hash("secret")
+
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    assert hasher.verify("secret", encoded)
+    assert not hasher.verify("wrong", encoded)
+
+
+def test_needs_rehash_when_cost_changes():
+    old_hasher = PasswordHasher(ScryptPasswordHasher(n=1024, r=8, p=1))
+    new_hasher = PasswordHasher(ScryptPasswordHasher(n=2048, r=8, p=1))
+    encoded = old_hasher.hash("secret")
+
+    assert not old_hasher.needs_rehash(encoded)
+    assert new_hasher.needs_rehash(encoded)
+    assert new_hasher.verify("secret", encoded)
+
+
+def test_needs_rehash_when_algorithm_changes():
+    scrypt = ScryptPasswordHasher(n=1024, r=8, p=1)
+    pbkdf2 = PBKDF2PasswordHasher(iterations=1000)
+    encoded = PasswordHasher(scrypt).hash("secret")
+
+    hasher = PasswordHasher(pbkdf2, scrypt)
+
+    assert hasher.verify("secret", encoded)
+    assert hasher.needs_rehash(encoded)
+
+
+def test_legacy_hash_is_verified_and_needs_rehash():
+    legacy = LegacySHA256PasswordHasher(salt="salt")
+    hasher = PasswordHasher(ScryptPasswordHasher(n=1024, r=8, p=1), legacy=legacy)
+    encoded = legacy.hash("secret")
+
+    assert hasher.verify("secret", encoded)
+    assert not hasher.verify("wrong", encoded)
+    assert hasher.needs_rehash(encoded)
+
+
+def test_unknown_or_malformed_hash_is_rejected():
+    hasher = PasswordHasher(ScryptPasswordHasher(n=1024, r=8, p=1))
+
+    assert not hasher.verify("secret", "bcrypt$12$salt$hash")
+    assert not hasher.verify("secret", "scrypt$broken")
+    assert not hasher.verify("secret", "legacy-hash-without-legacy-hasher")
+
+
+def test_hasher_is_picklable_for_process_pool():
+    hasher = PasswordHasher(ScryptPasswordHasher(n=1024, r=8, p=1), legacy=LegacySHA256PasswordHasher(salt="salt"))
+    encoded = hasher.hash("secret")
+
+    restored = pickle.loads(pickle.dumps(hasher))
+
+    assert restored.verify("secret", encoded)
@@ -0,0 +1,107 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.domain.user.bloom import BloomFilter
+from src.domain.user.dtos import RevokedTokenDTO
+from src.domain.user.revocation import RevocationList
+from tests.fixtures import FakeClock
+
+
+class FakeRevokedTokenRepo:
+    def __init__(self):
+        self.tokens: dict[str, RevokedTokenDTO] = {}
+
+    async def create(self, token: RevokedTokenDTO) -> RevokedTokenDTO:
+        self.tokens[token.jti] = token
+        return token
+
+    async def is_revoked(self, jti: str) -> bool:
+        return jti in self.tokens
+
+    async def get_active(self, now: datetime) -> list[RevokedTokenDTO]:
+        return [token for token in self.tokens.values() if token.expires_at > now]
+
+    async def get_revoked_since(self, since: datetime, now: datetime) -> list[RevokedTokenDTO]:
+        return [token for token in self.tokens.values() if token.revoked_at > since and token.expires_at > now]
+
+    async def delete_expired(self, now: datetime) -> None:
+        self.tokens = {jti: token for jti, token in self.tokens.items() if token.expires_at > now}
+
+
+def _revoked_token(jti: str, clock: FakeClock, expires_in: timedelta) -> RevokedTokenDTO:
+    return RevokedTokenDTO(jti=jti, expires_at=clock.now + expires_in, revoked_at=clock.now)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01, items=(f"item-{i}" for i in range(1000)))
+
+    assert all(f"item-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+@pytest.mark.anyio
+async def test_revocation_list_picks_up_new_tokens_incrementally():
+    clock = FakeClock(datetime(2025, 1, 1, tzinfo=UTC))
+    repo = FakeRevokedTokenRepo()
+    revocations = RevocationList(capacity=100, error_rate=0.001, clock=clock)
+    await repo.create(_revoked_token("first", clock, timedelta(hours=1)))
+    await revocations.sync(repo)
+
+    clock.now += timedelta(seconds=30)
+    await repo.create(_revoked_token("second", clock, timedelta(hours=1)))
+    assert not revocations.might_be_revoked("second")
+    await revocations.sync(repo)
+
+    assert revocations.might_be_revoked("first")
+    assert revocations.might_be_revoked("second")
+    assert not revocations.might_be_revoked("never-revoked")
+
+
+def test_revocation_list_reports_every_token_until_synced():
+    revocations = RevocationList(capacity=100, error_rate=0.001)
+
+    assert revocations.might_be_revoked("any")
+
+
+@pytest.mark.anyio
+async def test_revocation_list_drops_expired_tokens_once_per_rebuild_interval():
+    clock = FakeClock(datetime(2025, 1, 1, tzinfo=UTC))
+    repo = FakeRevokedTokenRepo()
+    revocations = RevocationList(capacity=100, error_rate=0.001, rebuild_interval=timedelta(minutes=10), clock=clock)
+    await repo.create(_revoked_token("short", clock, timedelta(minutes=1)))
+    await repo.create(_revoked_token("long", clock, timedelta(hours=1)))
+    await revocations.sync(repo)
+
+    clock.now += timedelta(minutes=2)
+    await revocations.sync(repo)
+    assert revocations.might_be_revoked("short")
+    assert set(repo.tokens) == {"short", "long"}
+
+    clock.now += timedelta(minutes=10)
+    await revocations.sync(repo)
+    assert not revocations.might_be_revoked("short")
+    assert revocations.might_be_revoked("long")
+    assert set(repo.tokens) == {"long"}
+
+
+@pytest.mark.anyio
+async def test_revocation_list_keeps_tokens_added_during_rebuild():
+    clock = FakeClock(datetime(2025, 1, 1, tzinfo=UTC))
+    repo = FakeRevokedTokenRepo()
+    revocations = RevocationList(capacity=100, error_rate=0.001, clock=clock)
+    revoked_meanwhile = _revoked_token("meanwhile", clock, timedelta(hours=1))
+    get_active = repo.get_active
+
+    async def get_active_while_revoking(now: datetime) -> list[RevokedTokenDTO]:
+        tokens = await get_active(now)
+        # Revoked by a logout in this process, after the table was read
+        await repo.create(revoked_meanwhile)
+        revocations.add(revoked_meanwhile)
+        return tokens
+
+    repo.get_active = get_active_while_revoking
+    await revocations.sync(repo)
+
+    assert revocations.might_be_revoked("meanwhile")
@@ -0,0 +1,33 @@
+from src.domain.user.token_cache import VerifiedTokenCache
+from tests.fixtures import FakeClock
+
+
+def test_cache_entry_expires_at_token_exp():
+    clock = FakeClock(1_000.0)
+    cache = VerifiedTokenCache(max_entries=10, max_bytes=1024 * 1024, ttl_seconds=60, clock=clock)
+    cache.set("token", {"sub": "alice", "exp": clock.now + 10})
+
+    clock.now += 11
+
+    assert cache.get("token") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats.entries == 0
+
+
+def test_cache_skips_already_expired_tokens():
+    clock = FakeClock(1_000.0)
+    cache = VerifiedTokenCache(max_entries=10, max_bytes=1024 * 1024, ttl_seconds=60, clock=clock)
+    cache.set("token", {"sub": "alice", "exp": clock.now - 1})
+
+    assert cache.stats.entries == 0
+
+
+def test_cache_evicts_by_memory():
+    cache = VerifiedTokenCache(max_entries=100, max_bytes=1024 * 1024, ttl_seconds=60)
+    cache.set("token-1", {"sub": "user-1"})
+    cache.max_bytes = cache.stats.size_bytes
+    cache.set("token-2", {"sub": "user-2"})
+
+    assert cache.stats.entries == 1
+    assert cache.get("token-2") is not None
+    assert cache.stats.size_bytes <= cache.max_bytes
@@ -0,0 +1,101 @@
+from datetime import UTC, datetime, timedelta
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from src.domain.user.tokens import TokenService
+
+
+def test_token_service_round_trip():
+    service = TokenService(secret_key="test_secret_key", algorithm="HS256")
+    token = service.encode({"sub": "alice"})
+
+    assert service.decode(token) == {"sub": "alice"}
+    assert jwt.decode(token, "test_secret_key", algorithms=["HS256"]) == {"sub": "alice"}
+
+
+def test_token_service_rejects_foreign_signature():
+    service = TokenService(secret_key="test_secret_key", algorithm="HS256")
+    token = jwt.encode({"sub": "alice"}, "another_secret_key", algorithm="HS256")
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        service.decode(token)
+
+
+def test_token_service_rejects_expired_token():
+    service = TokenService(secret_key="test_secret_key", algorithm="HS256")
+    token = service.encode({"sub": "alice", "exp": datetime.now(UTC) - timedelta(minutes=1)})
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        service.decode(token)
+
+
+def test_token_service_rejects_not_allowed_algorithm():
+    service = TokenService(secret_key="test_secret_key", algorithm="HS256")
+    token = jwt.encode({"sub": "alice"}, "test_secret_key", algorithm="HS512")
+
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        service.decode(token)
+
+
+def _ed25519_private_key_pem() -> str:
+    private_key = Ed25519PrivateKey.generate()
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+def _public_key_pem(private_key_pem: str) -> str:
+    private_key = serialization.load_pem_private_key(private_key_pem.encode(), password=None)
+    return (
+        private_key.public_key()
+        .public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+
+def test_asymmetric_token_has_kid_and_verifies_with_jwks():
+    service = TokenService(algorithm="EdDSA", signing_keys={"key-1": _ed25519_private_key_pem()})
+    token = service.encode({"sub": "alice"})
+
+    assert jwt.get_unverified_header(token)["kid"] == "key-1"
+    assert service.decode(token) == {"sub": "alice"}
+
+    jwks = jwt.PyJWKSet.from_dict(service.jwks)
+    public_key = jwks["key-1"]
+    assert jwt.decode(token, public_key, algorithms=["EdDSA"]) == {"sub": "alice"}
+
+
+def test_asymmetric_key_rotation_keeps_old_tokens_valid():
+    old_key = _ed25519_private_key_pem()
+    new_key = _ed25519_private_key_pem()
+    old_service = TokenService(algorithm="EdDSA", signing_keys={"old": old_key})
+    old_token = old_service.encode({"sub": "alice"})
+
+    # The new key is published before it becomes active
+    overlapping_service = TokenService(
+        algorithm="EdDSA",
+        signing_keys={"old": old_key, "new": new_key},
+        active_key_id="old",
+    )
+    assert {key["kid"] for key in overlapping_service.jwks["keys"]} == {"old", "new"}
+
+    rotated_service = TokenService(
+        algorithm="EdDSA",
+        signing_keys={"new": new_key},
+        verification_keys={"old": _public_key_pem(old_key)},
+    )
+    new_token = rotated_service.encode({"sub": "bob"})
+
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert rotated_service.decode(old_token) == {"sub": "alice"}
+    assert rotated_service.decode(new_token) == {"sub": "bob"}
+    with pytest.raises(jwt.InvalidSignatureError):
+        old_service.decode(new_token)
@@ -1,13 +1,18 @@
+from datetime import UTC, datetime
+
 import jwt
 import pytest
 from pydantic import SecretStr
 
-from src.domain.user.dtos import CreateUserDTO, LoginUserDTO, UserDTO
+from src.domain.user.dtos import CreateUserDTO, LoginUserDTO, RevokedTokenDTO, UserDTO, UserIdentityDTO
 from src.domain.user.errors import (
     InvalidPasswordError,
+    InvalidRefreshTokenError,
+    RefreshTokenReuseError,
     UserAlreadyExistsError,
     UserDoesNotExistError,
 )
+from src.domain.user.hashers import LegacySHA256PasswordHasher
 from src.domain.user.user import User
 from src.settings import settings
 
@@ -89,3 +94,122 @@ async def test_get_current_invalid_or_unknown_user(user_aggregate: User):
 
     with pytest.raises(UserDoesNotExistError):
         await user_aggregate.get_current(token)
+
+
+@pytest.mark.anyio
+async def test_login_rehashes_legacy_password_hash(user_aggregate: User, user_repository):
+    username = "frank"
+    password = SecretStr("pw")
+    legacy_hash = LegacySHA256PasswordHasher(salt=settings.AUTH_PASSWORD_SALT.get_secret_value()).hash("pw")
+    await user_repository.create(UserDTO(username=username, password_hash=legacy_hash))
+
+    await user_aggregate.login(LoginUserDTO(username=username, password=password))
+
+    user = await user_repository.find_by_username(username)
+    assert user.password_hash.get_secret_value().startswith("scrypt$")
+    # The new hash still matches the password
+    await user_aggregate.login(LoginUserDTO(username=username, password=password))
+
+
+@pytest.mark.anyio
+async def test_get_password_hash(user_repository):
+    await user_repository.create(UserDTO(username="ivan", password_hash="hash"))
+
+    assert await user_repository.get_password_hash("ivan") == "hash"
+    assert await user_repository.get_password_hash("nobody") is None
+
+
+@pytest.mark.anyio
+async def test_get_current_identity_from_stateless_token(user_aggregate: User, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_STATELESS_TOKENS", True)
+    username = "grace"
+    await user_aggregate.create(CreateUserDTO(username=username, password=SecretStr("pw")))
+    token = await user_aggregate.login(LoginUserDTO(username=username, password=SecretStr("pw")))
+
+    payload = jwt.decode(
+        token,
+        settings.AUTH_SECRET_KEY.get_secret_value(),
+        algorithms=[settings.AUTH_HASH_ALGORITHM],
+    )
+    assert payload[settings.AUTH_ACCESS_TOKEN_USER_FIELD] == {"username": username}
+
+    identity = await user_aggregate.get_current_identity(token)
+    assert identity == UserIdentityDTO(username=username)
+
+
+@pytest.mark.anyio
+async def test_logout_revokes_token(user_aggregate: User):
+    username = "heidi"
+    await user_aggregate.create(CreateUserDTO(username=username, password=SecretStr("pw")))
+    token = await user_aggregate.login(LoginUserDTO(username=username, password=SecretStr("pw")))
+    other_token = await user_aggregate.login(LoginUserDTO(username=username, password=SecretStr("pw")))
+
+    await user_aggregate.logout(token)
+
+    with pytest.raises(UserDoesNotExistError):
+        await user_aggregate.get_current(token)
+    assert (await user_aggregate.get_current(other_token)).username == username
+
+
+@pytest.mark.anyio
+async def test_logout_of_concurrently_revoked_token(user_aggregate: User, revoked_token_repository):
+    await user_aggregate.create(CreateUserDTO(username="ivan2", password=SecretStr("pw")))
+    token = await user_aggregate.login(LoginUserDTO(username="ivan2", password=SecretStr("pw")))
+    claims = jwt.decode(token, options={"verify_signature": False})
+    # Revoked by another logout this process doesn't know about yet
+    await revoked_token_repository.revoke(
+        RevokedTokenDTO(
+            jti=claims["jti"],
+            expires_at=datetime.fromtimestamp(claims["exp"], UTC),
+            revoked_at=datetime.now(UTC),
+        ),
+    )
+
+    await user_aggregate.logout(token)
+
+    with pytest.raises(UserDoesNotExistError):
+        await user_aggregate.get_current(token)
+
+
+@pytest.mark.anyio
+async def test_refresh_rotates_refresh_token(user_aggregate: User):
+    username = "ivan"
+    await user_aggregate.create(CreateUserDTO(username=username, password=SecretStr("pw")))
+    tokens = await user_aggregate.login_with_refresh_token(LoginUserDTO(username=username, password=SecretStr("pw")))
+
+    refreshed = await user_aggregate.refresh(tokens.refresh_token)
+
+    assert refreshed.refresh_token != tokens.refresh_token
+    assert (await user_aggregate.get_current(refreshed.access_token)).username == username
+
+
+@pytest.mark.anyio
+async def test_refresh_token_reuse_revokes_family(user_aggregate: User):
+    username = "judy"
+    await user_aggregate.create(CreateUserDTO(username=username, password=SecretStr("pw")))
+    tokens = await user_aggregate.login_with_refresh_token(LoginUserDTO(username=username, password=SecretStr("pw")))
+    refreshed = await user_aggregate.refresh(tokens.refresh_token)
+
+    with pytest.raises(RefreshTokenReuseError):
+        await user_aggregate.refresh(tokens.refresh_token)
+    # The token issued by the legitimate rotation is revoked along with the reused one
+    with pytest.raises(InvalidRefreshTokenError):
+        await user_aggregate.refresh(refreshed.refresh_token)
+
+
+@pytest.mark.anyio
+async def test_introspect_reports_each_token(user_aggregate: User):
+    username = "kate"
+    await user_aggregate.create(CreateUserDTO(username=username, password=SecretStr("pw")))
+    valid_token = await user_aggregate.login(LoginUserDTO(username=username, password=SecretStr("pw")))
+    unknown_user_token = jwt.encode(
+        {settings.AUTH_ACCESS_TOKEN_USERNAME_FIELD: "ghost"},
+        settings.AUTH_SECRET_KEY.get_secret_value(),
+        algorithm=settings.AUTH_HASH_ALGORITHM,
+    )
+
+    results = await user_aggregate.introspect([valid_token, "not-a-token", unknown_user_token])
+
+    assert [result.active for result in results] == [True, False, False]
+    assert results[0].username == username
+    assert results[0].expires_at is not None